@@ -2,16 +2,50 @@ import stanza
 from pathlib import Path
 from collections import defaultdict
 import json
-from typing import Dict, List, Tuple
+import importlib.util
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
 
+# Load the analysis module for its shared helpers (digit-prefixed filename)
+spec = importlib.util.spec_from_file_location(
+    "nlp_analysis", Path(__file__).parent / "display/latin-spanish-complexity/code/02_nlp_analysis.py")
+nlp_analysis = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(nlp_analysis)
+
+TextHandle = nlp_analysis.TextHandle
+
+# Emerging analytical patterns: an auxiliary or verb with a participle
+# among the next 3 words
+MEDIEVAL_PATTERNS = nlp_analysis.PatternSet([
+    ('medieval', 'possible_analytical', '{upos:AUX|VERB}=verb ..3 {upos:VERB;feats:VerbForm=Part}=participle')
+])
+
 class CorpusDebugger:
-    def __init__(self):
-        self.latin_nlp = stanza.Pipeline('la')
-        self.spanish_nlp = stanza.Pipeline('es')
-        self.corpus_dir = Path("corpus")
+    def __init__(self, processors: Optional[str] = 'tokenize,mwt,pos'):
+        # Pipelines are built lazily on first use. The debugger only reads
+        # UPOS and feats, so it skips lemma, depparse and NER by default
+        self.processors = processors
+        self._pipelines = {}
+        self.corpus_dir = nlp_analysis.CORPUS_DIR
         self.debug_results = defaultdict(dict)
 
+    def get_pipeline(self, language: str) -> stanza.Pipeline:
+        """Return the Stanza pipeline for a language, building it on first use"""
+        if language not in self._pipelines:
+            if self.processors:
+                self._pipelines[language] = stanza.Pipeline(language, processors=self.processors)
+            else:
+                self._pipelines[language] = stanza.Pipeline(language)
+        return self._pipelines[language]
+
+    @property
+    def latin_nlp(self) -> stanza.Pipeline:
+        return self.get_pipeline('la')
+
+    @property
+    def spanish_nlp(self) -> stanza.Pipeline:
+        return self.get_pipeline('es')
+
     def load_sample_texts(self, sample_size: int = 1000) -> Dict[str, str]:
         """Load sample from each text for debugging"""
         samples = {}
@@ -20,9 +54,8 @@ class CorpusDebugger:
         for period in ['classical_latin', 'medieval_latin', 'early_spanish']:
             dir_path = self.corpus_dir / period
             for text_file in dir_path.glob("*.txt"):
-                with open(text_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    samples[f"{period}_{text_file.stem}"] = content[:sample_size]
+                # Only the first sample_size characters are decoded
+                samples[f"{period}_{text_file.stem}"] = TextHandle(text_file).prefix(sample_size)
         
         return samples
 
@@ -71,20 +104,12 @@ class CorpusDebugger:
 
     def _check_medieval_patterns(self, sentence, analysis: Dict):
         """Special checks for medieval Latin patterns"""
-        words = sentence.words
-        
-        # Look for emerging analytical patterns
-        for i, word in enumerate(words):
-            if word.upos == 'AUX' or word.upos == 'VERB':
-                # Look ahead for participles or infinitives
-                for next_word in words[i+1:i+4]:  # Check next 3 words
-                    if next_word.upos == 'VERB':
-                        if 'VerbForm=Part' in (next_word.feats or ''):
-                            analysis['potential_constructions'].append({
-                                'type': 'possible_analytical',
-                                'pattern': f"{word.text} ... {next_word.text}",
-                                'context': sentence.text
-                            })
+        for _, label, binding in MEDIEVAL_PATTERNS.matches(sentence):
+            analysis['potential_constructions'].append({
+                'type': label,
+                'pattern': f"{binding['verb'].text} ... {binding['participle'].text}",
+                'context': sentence.text
+            })
 
     def compare_across_periods(self, samples: Dict[str, str]) -> Dict:
         """Compare linguistic features across periods"""
@@ -3,25 +3,29 @@
 Detailed diagnostic of article detection across periods
 """
 
-import sys
 import importlib.util
-import json
 import numpy as np
-from collections import defaultdict
+from pathlib import Path
 
-# Load the module with space in filename
-spec = importlib.util.spec_from_file_location("example_1", "example 1.py")
-example_1 = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(example_1)
+# Load the analysis module (digit-prefixed filename)
+spec = importlib.util.spec_from_file_location(
+    "nlp_analysis", Path(__file__).parent / "display/latin-spanish-complexity/code/02_nlp_analysis.py")
+nlp_analysis = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(nlp_analysis)
 
-EnhancedComplexityTracker = example_1.EnhancedComplexityTracker
+EnhancedComplexityTracker = nlp_analysis.EnhancedComplexityTracker
+
+PERIOD_NAMES = {
+    'Classical': 'Classical Latin',
+    'Medieval': 'Medieval Latin',
+    'Spanish': 'Early Spanish'
+}
 
 def detailed_article_diagnosis():
     print("DETAILED ARTICLE DETECTION DIAGNOSIS")
     print("=" * 60)
     
     tracker = EnhancedComplexityTracker()
-    corpus = tracker.load_corpus()
     
     # Let's examine what determiners are found in each period
     period_analysis = {
@@ -30,19 +34,14 @@ def detailed_article_diagnosis():
         'Early Spanish': []
     }
     
-    for text_name, text_content in corpus.items():
-        # Determine period and language
-        if text_name.startswith('latin_'):
-            period = 'Classical Latin'
-            language = 'la'
-        elif text_name.startswith('medieval_'):
-            period = 'Medieval Latin'
-            language = 'la'
-        elif text_name.startswith('spanish_'):
-            period = 'Early Spanish'
-            language = 'es'
-        else:
+    for text in tracker.corpus():
+        # Period and language come from the corpus manifest
+        period = PERIOD_NAMES.get(text.period)
+        if period is None:
             continue
+        text_name = text.id
+        language = text.language
+        text_content = text.handle()
         
         print(f"\n{'='*40}")
         print(f"ANALYZING: {text_name}")
@@ -1,11 +1,134 @@
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
 import time
 
+# Texts and the corpus manifest live under the project's data/raw_texts,
+# the same directory 02_nlp_analysis.py reads by default
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+CORPUS_DIR = PROJECT_DIR / "data" / "raw_texts"
+HTTP_CACHE_DIR = PROJECT_DIR / "data" / "http_cache"
+
+class HostRateLimiter:
+    """
+    Spaces requests to the same host at least min_interval seconds apart.
+
+    Each host has its own lock, so requests to different hosts never wait
+    on each other.
+    """
+    def __init__(self, min_interval: float = 2.0):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def wait(self, url: str):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = [threading.Lock(), 0.0]
+            state = self._hosts[host]
+        with state[0]:
+            delay = state[1] - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            state[1] = time.monotonic() + self.min_interval
+
+class HTTPCache:
+    """
+    On-disk cache of fetched pages, keyed on the URL's SHA-256.
+
+    Each entry stores the decoded body with its ETag and Last-Modified
+    validators, so stale entries can be revalidated with a conditional
+    request instead of downloaded again.
+    """
+    def __init__(self, cache_dir: Path = HTTP_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the cached entry for url, or None on a miss"""
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put(self, url: str, response: requests.Response) -> Dict:
+        """Store a 200 response and return its entry"""
+        entry = {
+            'url': url,
+            'fetched_at': time.time(),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'text': response.text
+        }
+        self._write(url, entry)
+        return entry
+
+    def touch(self, url: str, entry: Dict):
+        """Mark an entry as fresh after a 304 Not Modified"""
+        entry['fetched_at'] = time.time()
+        self._write(url, entry)
+
+    def _write(self, url: str, entry: Dict):
+        # Write to a temporary file first so a crash never leaves a
+        # truncated entry behind
+        path = self._path(url)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_name, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
 class CorpusDownloader:
-    def __init__(self):
-        self.base_dir = Path("corpus")
+    """
+    Downloads the corpus texts in a thread pool.
+
+    Requests go through one pooled requests.Session, are spaced per host by
+    a HostRateLimiter, and are cached in an HTTPCache: entries younger than
+    max_age seconds are used without any request, older ones are
+    revalidated with If-None-Match / If-Modified-Since. Pass session and
+    base_url (which replaces the scheme and host of every source URL) to
+    run against a local stub server, or a FakeSession to run offline (see
+    self_check).
+    """
+    def __init__(self, base_dir: Path = CORPUS_DIR,
+                 cache_dir: Optional[Path] = HTTP_CACHE_DIR,
+                 session: Optional[requests.Session] = None,
+                 base_url: Optional[str] = None,
+                 workers: int = 4, min_interval: float = 2.0,
+                 max_age: float = 24 * 3600, timeout: float = 30):
+        self.base_dir = Path(base_dir)
+        self.workers = workers
+        self.base_url = base_url
+        self.max_age = max_age
+        self.timeout = timeout
+        self.rate_limiter = HostRateLimiter(min_interval)
+        # Pass cache_dir=None to always download
+        self.http_cache = HTTPCache(cache_dir) if cache_dir is not None else None
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
         self.setup_directories()
 
     def setup_directories(self):
@@ -19,13 +142,48 @@ class CorpusDownloader:
         for dir_name in directories:
             (self.base_dir / dir_name).mkdir(parents=True, exist_ok=True)
 
+    def _resolve(self, url: str) -> str:
+        """Point a source URL at base_url, if one was given"""
+        if not self.base_url:
+            return url
+        base = urlsplit(self.base_url)
+        parts = urlsplit(url)
+        return urlunsplit((base.scheme, base.netloc, base.path.rstrip('/') + parts.path,
+                           parts.query, parts.fragment))
+
+    def fetch(self, url: str) -> str:
+        """Return the body of url, from the HTTP cache where possible"""
+        url = self._resolve(url)
+        entry = self.http_cache.get(url) if self.http_cache is not None else None
+        if entry is not None and time.time() - entry['fetched_at'] < self.max_age:
+            return entry['text']
+
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        self.rate_limiter.wait(url)
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            # Only a conditional request can be answered with a 304; without
+            # a cached body there is nothing to return, and an empty body
+            # must not be saved as the text
+            if entry is None:
+                raise requests.HTTPError(f"304 Not Modified for unconditional request: {url}",
+                                         response=response)
+            self.http_cache.touch(url, entry)
+            return entry['text']
+        response.raise_for_status()
+        if self.http_cache is not None:
+            self.http_cache.put(url, response)
+        return response.text
+
     def download_latin_library(self, url: str, output_path: Path):
         """Download text from The Latin Library"""
-        # Be nice to the server
-        time.sleep(2)
-        
-        response = requests.get(url)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(self.fetch(url), 'html.parser')
         
         # The Latin Library typically has the text in the body
         # Remove headers and navigation
@@ -62,8 +220,7 @@ class CorpusDownloader:
             # For El Cid, we can use this version which is more reliably accessible
             url = "https://www.cervantesvirtual.com/obra-visor/poema-de-mio-cid--0/html/fee9b2e6-82b1-11df-acc7-002185ce6064_2.html"
         
-            response = requests.get(url)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(self.fetch(url), 'html.parser')
         
         # The content is usually in paragraphs within the main content area
             text_content = soup.select('div.contenido p')  # Try this selector first
@@ -78,8 +235,7 @@ class CorpusDownloader:
             else:
             # If we can't find it with either selector, try the alternative URL
                 alt_url = "https://www.cervantesvirtual.com/obra-visor/cantar-de-mio-cid--0/html/fee9b2e6-82b1-11df-acc7-002185ce6064_2.html"
-                response = requests.get(alt_url)
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = BeautifulSoup(self.fetch(alt_url), 'html.parser')
                 text_content = soup.select('div.content-text')
             
                 if text_content:
@@ -132,8 +288,35 @@ class CorpusDownloader:
     
         return '\n'.join(cleaned_lines)
 
-    def download_all_texts(self):
-        """Download all corpus texts"""
+    def manifest_jobs(self, manifest_path: Path):
+        """Download jobs for every manifest entry that has a url"""
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        jobs = []
+        for entry in manifest['texts']:
+            if not entry.get('url'):
+                continue
+            if 'cervantesvirtual' in urlsplit(entry['url']).netloc:
+                download = self.download_cervantes
+            else:
+                download = self.download_latin_library
+            output_path = self.base_dir / entry['path']
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            jobs.append((entry['id'], entry['url'], output_path, download))
+        return jobs
+
+    def download_all_texts(self, manifest_path: Optional[Path] = None):
+        """
+        Download all corpus texts
+
+        Sources come from the corpus manifest (base_dir/manifest.json by
+        default) when there is one, otherwise from the built-in lists below.
+        """
+        manifest_path = Path(manifest_path) if manifest_path else self.base_dir / "manifest.json"
+        if manifest_path.exists():
+            self._run_jobs(self.manifest_jobs(manifest_path))
+            return
+
         # Classical Latin
         classical_texts = {
             'caesar_bg_1': 'http://thelatinlibrary.com/caesar/gall1.shtml',
@@ -151,45 +334,34 @@ class CorpusDownloader:
             'cid': 'https://www.cervantesvirtual.com/obra-visor/cantar-de-mio-cid--0/html/'
         }
 
+        jobs = []
+        for folder, texts, download in (("classical_latin", classical_texts, self.download_latin_library),
+                                        ("medieval_latin", medieval_texts, self.download_latin_library),
+                                        ("early_spanish", spanish_texts, self.download_cervantes)):
+            for name, url in texts.items():
+                jobs.append((name, url, self.base_dir / folder / f"{name}.txt", download))
+        self._run_jobs(jobs)
+
+    def _run_jobs(self, jobs):
+        """Run (name, url, output_path, download) jobs in the thread pool"""
         print("Starting downloads...")
-        
-        # Download Classical Latin texts
-        for name, url in classical_texts.items():
-            output_path = self.base_dir / "classical_latin" / f"{name}.txt"
-            print(f"Downloading {name}...")
-            try:
-                self.download_latin_library(url, output_path)
-                print(f"Successfully downloaded {name}")
-            except Exception as e:
-                print(f"Error downloading {name}: {e}")
-            time.sleep(2)  # Be nice to the server
-
-        # Download Medieval Latin texts
-        for name, url in medieval_texts.items():
-            output_path = self.base_dir / "medieval_latin" / f"{name}.txt"
-            print(f"Downloading {name}...")
-            try:
-                self.download_latin_library(url, output_path)
-                print(f"Successfully downloaded {name}")
-            except Exception as e:
-                print(f"Error downloading {name}: {e}")
-            time.sleep(2)
-
-        # Download Early Spanish texts
-        for name, url in spanish_texts.items():
-            output_path = self.base_dir / "early_spanish" / f"{name}.txt"
-            print(f"Downloading {name}...")
-            try:
-                self.download_cervantes(url, output_path)
-                print(f"Successfully downloaded {name}")
-            except Exception as e:
-                print(f"Error downloading {name}: {e}")
-            time.sleep(2)
+
+        # Hosts are rate limited individually, so texts from different
+        # sites download in parallel
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(download, url, output_path): name
+                       for name, url, output_path, download in jobs}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    future.result()
+                    print(f"Successfully downloaded {name}")
+                except Exception as e:
+                    print(f"Error downloading {name}: {e}")
 
     def download_cervantes(self, url: str, output_path: Path):
         """Download and clean text from Cervantes Virtual"""
-        response = requests.get(url)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(self.fetch(url), 'html.parser')
         
         # Cervantes Virtual typically has the text in specific div classes
         # We'll need to adjust these selectors based on the actual HTML structure
@@ -219,6 +391,76 @@ class CorpusDownloader:
         
         return '\n'.join(cleaned_lines)
 
+class FakeSession:
+    """
+    Offline stand-in for requests.Session: serves canned responses and
+    records each request's URL and headers. routes maps a URL to a list of
+    (status, body, headers) tuples, served in order.
+    """
+    def __init__(self, routes: Dict):
+        self.routes = {url: list(responses) for url, responses in routes.items()}
+        self.requests = []
+
+    def get(self, url: str, headers: Optional[Dict] = None, timeout: Optional[float] = None):
+        self.requests.append((url, dict(headers or {})))
+        status, body, response_headers = self.routes[url].pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response.url = url
+        response.encoding = 'utf-8'
+        response.headers.update(response_headers)
+        response._content = body.encode('utf-8')
+        return response
+
+def self_check():
+    """
+    Exercise fetch and its HTTP cache against a FakeSession, without
+    network access: a first download is cached with its validators, a
+    fresh entry is served without a request, a stale one is revalidated
+    and a 304 keeps the cached body, and a 304 with no cached body is an
+    error rather than an empty text.
+    """
+    url = "http://example.org/text.html"
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_dir = Path(tmp_dir)
+        session = FakeSession({url: [(200, "Gallia est omnis divisa", {'ETag': '"v1"'}),
+                                     (304, "", {}),
+                                     (304, "", {})]})
+        downloader = CorpusDownloader(base_dir=tmp_dir / "texts", cache_dir=tmp_dir / "cache",
+                                      session=session, min_interval=0)
+
+        assert downloader.fetch(url) == "Gallia est omnis divisa"
+        assert downloader.fetch(url) == "Gallia est omnis divisa"
+        assert len(session.requests) == 1, "fresh cache entry was re-requested"
+
+        downloader.max_age = 0
+        assert downloader.fetch(url) == "Gallia est omnis divisa"
+        assert session.requests[-1][1].get('If-None-Match') == '"v1"', "stale entry was not revalidated"
+
+        uncached = CorpusDownloader(base_dir=tmp_dir / "texts", cache_dir=None,
+                                    session=session, min_interval=0)
+        try:
+            uncached.fetch(url)
+        except requests.HTTPError:
+            pass
+        else:
+            raise AssertionError("304 without a cached body was accepted")
+    print("Downloader self-check passed")
+
 if __name__ == "__main__":
-    downloader = CorpusDownloader()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Download the corpus texts")
+    parser.add_argument('--corpus-dir', type=Path, default=CORPUS_DIR,
+                        help="corpus directory holding manifest.json and the texts")
+    parser.add_argument('--self-check', action='store_true',
+                        help="check fetch and the HTTP cache offline against a fake session, "
+                             "then exit without downloading")
+    args = parser.parse_args()
+
+    if args.self_check:
+        self_check()
+        parser.exit()
+
+    downloader = CorpusDownloader(base_dir=args.corpus_dir)
     downloader.download_all_texts()
@@ -1,50 +1,1736 @@
-import stanza
-from collections import defaultdict
+from __future__ import annotations
+from collections import Counter, defaultdict, deque
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-import matplotlib.pyplot as plt
-import seaborn as sns
+from typing import TYPE_CHECKING, Dict, Iterator, List, Tuple, Optional
 import json 
 import scipy.stats as stats
 import traceback
+import gzip
+import hashlib
+import os
+import tempfile
+import re
+import itertools
+import math
+import sqlite3
+import mmap
+import io
+import codecs
+import heapq
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
-class EnhancedComplexityTracker:
+# Stanza (and with it torch) is imported where a text is parsed, so the
+# results store and statistics helpers below load without it; this keeps
+# recalculate_stats.py and 03_create_figures.py quick to start
+if TYPE_CHECKING:
+    import stanza
+
+# Project directory (display/latin-spanish-complexity), so the results store
+# is found from wherever the scripts are run. 03_create_figures.py and
+# recalculate_stats.py import RESULTS_DB from here.
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DB = PROJECT_DIR / "data" / "processed" / "results.sqlite"
+# Parse cache shared by every script, wherever it is run from
+PARSE_CACHE_DIR = PROJECT_DIR / "data" / "processed" / "parse_cache"
+# Corpus texts and their manifest.json (written by 01_download_texts.py)
+CORPUS_DIR = PROJECT_DIR / "data" / "raw_texts"
+
+class ParseCache:
+    """
+    Content-addressed on-disk cache of parsed Stanza Documents.
+
+    Entries are keyed on the text's SHA-256, the language, the Stanza
+    version and the processor configuration, and stored as gzipped
+    Stanza dicts. When the cache grows past max_bytes the least recently
+    used entries are evicted.
+
+    The cache size is tracked in memory: the directory is scanned once, on
+    the first put, and again only when the running total passes
+    max_bytes. Eviction then goes down to EVICT_TO of max_bytes, so a full
+    cache is rescanned once per that much newly written data rather than
+    on every put. Each rescan also picks up entries written by other
+    processes sharing the directory.
+    """
+    # Fraction of max_bytes an eviction brings the cache down to
+    EVICT_TO = 0.9
+
+    def __init__(self, cache_dir: Path = PARSE_CACHE_DIR,
+                 max_bytes: int = 2 * 1024 ** 3):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Bytes on disk as of the last scan plus this process's puts since
+        self._total = None
+
+    def key(self, text: str, language: str, processors: str = 'default') -> str:
+        """Build the cache key for a text parsed with a given pipeline"""
+        import stanza
+        digest = hashlib.sha256()
+        for part in (text, language, stanza.__version__, processors):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json.gz"
+
+    def get(self, key: str, text: str) -> Optional[stanza.Document]:
+        """Return the cached Document for key, or None on a miss"""
+        import stanza
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                sentences = json.load(f)
+        except (FileNotFoundError, EOFError, OSError, ValueError):
+            return None
+        # Touch the entry so eviction keeps recently used parses
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        # JSON turns multi-word token id tuples into lists
+        for sentence in sentences:
+            for entry in sentence:
+                if isinstance(entry.get('id'), list):
+                    entry['id'] = tuple(entry['id'])
+        return stanza.Document(sentences, text=text)
+
+    def put(self, key: str, doc: stanza.Document):
+        """Store a Document and evict old entries if over budget"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see
+        # a partially written entry
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                f.write(json.dumps(doc.to_dict(), ensure_ascii=False).encode('utf-8'))
+            os.replace(tmp_name, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+        if self._total is None:
+            self.evict()
+            return
+        try:
+            self._total += path.stat().st_size
+        except FileNotFoundError:
+            pass
+        if self._total > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """
+        Rescan the cache and, if it is over max_bytes, remove least recently
+        used entries until it is within EVICT_TO of max_bytes
+        """
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.json.gz"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        if total > self.max_bytes:
+            target = self.max_bytes * self.EVICT_TO
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+        self._total = total
+
+# Bump whenever an analyzer changes what it reports, so stored per-text
+# results from older code are re-analyzed instead of reused
+ANALYZER_VERSION = 4
+
+# Result dicts keyed by integers, which JSON turns into strings
+_INT_KEYED_RESULTS = ('dependency_distances', 'depth_histogram')
+
+def _json_default(value):
+    """JSON fallback for numpy scalars and arrays in analysis results"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _restore_int_keys(result: Dict) -> Dict:
+    """Turn the string keys of integer-keyed result dicts back into ints"""
+    for key, value in result.items():
+        if isinstance(value, dict):
+            if key in _INT_KEYED_RESULTS:
+                result[key] = {int(k): v for k, v in value.items()}
+            else:
+                _restore_int_keys(value)
+    return result
+
+# Text name prefix of each period, as written by the folder-scan fallback
+# of Corpus; only used for results that carry no metadata
+PERIOD_PREFIXES = {'latin_': 'Classical', 'medieval_': 'Medieval', 'spanish_': 'Spanish'}
+
+def period_for(text_name: str, result: Optional[Dict] = None) -> Optional[str]:
+    """Period of a corpus text, from its result metadata or else its name prefix"""
+    if result is not None and result.get('metadata', {}).get('period'):
+        return result['metadata']['period']
+    for prefix, period in PERIOD_PREFIXES.items():
+        if text_name.startswith(prefix):
+            return period
+    return None
+
+class TextHandle:
+    """
+    Lazy, mmap-backed view of a UTF-8 text file.
+
+    Nothing is read until a method asks for text, and then only the bytes
+    that are needed are decoded: prefix() and sample() touch a few pages,
+    iter_text() decodes block by block, and only read() materializes the
+    whole file. Newlines are translated like open() in text mode. Handles
+    pickle as their path, so they are cheap to send to worker processes.
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = None
+        self._mmap = None
+
+    def _map(self):
+        if self._mmap is None:
+            self._file = open(self.path, 'rb')
+            size = os.fstat(self._file.fileno()).st_size
+            # mmap cannot map an empty file
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        return self._mmap
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._map())
+
+    @staticmethod
+    def _decoder():
+        return io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(errors='replace'),
+                                            translate=True)
+
+    def _char_boundary(self, offset: int) -> int:
+        """First offset at or after offset that starts a UTF-8 character"""
+        data = self._map()
+        while offset < len(data) and data[offset] & 0xC0 == 0x80:
+            offset += 1
+        return offset
+
+    def _decode_from(self, offset: int, n_chars: int) -> str:
+        # A character is at most 4 UTF-8 bytes (plus one for a \r\n pair)
+        offset = self._char_boundary(offset)
+        return self._decoder().decode(self._map()[offset:offset + 5 * n_chars])[:n_chars]
+
+    def prefix(self, n_chars: int) -> str:
+        """The first n_chars characters"""
+        return self._decode_from(0, n_chars)
+
+    def range(self, start: int, stop: int) -> str:
+        """The text between two byte offsets, snapped forward to character boundaries"""
+        start, stop = self._char_boundary(start), self._char_boundary(stop)
+        return self._decoder().decode(self._map()[start:stop], final=True)
+
+    def sample(self, n_chars: int, pieces: int = 5, seed: int = 0) -> str:
+        """About n_chars characters taken as pieces windows at seeded random offsets"""
+        size = self.size_bytes
+        window = max(1, n_chars // pieces)
+        if size <= 5 * n_chars:
+            return self.prefix(n_chars)
+        rng = np.random.default_rng(seed)
+        offsets = np.sort(rng.integers(0, size - 5 * window, size=pieces))
+        return '\n'.join(self._decode_from(int(offset), window) for offset in offsets)
+
+    def iter_text(self, block_bytes: int = 1 << 20) -> Iterator[str]:
+        """Decode the file incrementally, one block of about block_bytes at a time"""
+        data = self._map()
+        decoder = self._decoder()
+        for start in range(0, len(data), block_bytes):
+            text = decoder.decode(data[start:start + block_bytes])
+            if text:
+                yield text
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+    def iter_paragraph_blocks(self, min_chars: int = 1 << 20) -> Iterator[str]:
+        """
+        Decode incrementally into blocks of at least min_chars characters
+        that end at a paragraph break (except the last), so paragraphs are
+        never split between blocks.
+        """
+        buffer = ''
+        for text in self.iter_text():
+            buffer += text
+            if len(buffer) < min_chars:
+                continue
+            breaks = list(re.finditer(r'\n\s*\n', buffer))
+            if breaks:
+                cut = breaks[-1].end()
+                yield buffer[:cut]
+                buffer = buffer[cut:]
+        if buffer:
+            yield buffer
+
+    def read(self) -> str:
+        """The whole text"""
+        return self._decoder().decode(self._map()[:], final=True)
+
+    def __getitem__(self, index) -> str:
+        # text[:n] is the common way to peek at a text; serve it from the prefix
+        if isinstance(index, slice) and not index.start and index.step is None and index.stop is not None and index.stop >= 0:
+            return self.prefix(index.stop)
+        return self.read()[index]
+
+    def __str__(self) -> str:
+        return self.read()
+
+    def close(self):
+        if self._mmap is not None:
+            if not isinstance(self._mmap, bytes):
+                self._mmap.close()
+            self._file.close()
+            self._mmap = self._file = None
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def __del__(self):
+        self.close()
+
+class CorpusText:
+    """One corpus text as described by the manifest; the file is read on demand"""
+    def __init__(self, id: str, period: str, language: str, path: Path,
+                 source: Optional[str] = None, date: Optional[str] = None, **extra):
+        self.id = id
+        self.period = period
+        self.language = language
+        self.path = Path(path)
+        self.source = source
+        self.date = date
+        self.extra = extra
+
+    def handle(self) -> TextHandle:
+        """Lazy mmap-backed handle on the text's file"""
+        return TextHandle(self.path)
+
+    def read(self) -> str:
+        return self.handle().read()
+
+    def metadata(self) -> Dict:
+        return {'id': self.id, 'period': self.period, 'language': self.language,
+                'source': self.source, 'date': self.date}
+
+class Corpus:
+    """
+    Manifest-driven view of the corpus.
+
+    manifest.json in the corpus directory lists every text with its id,
+    period, language, source, date and path (relative to the manifest).
+    Without a manifest the three period folders are scanned instead and
+    period and language come from the folder. Texts are only read when
+    asked for, and filter() narrows the corpus without opening any file.
+    """
+    MANIFEST_NAME = "manifest.json"
+    # Fallback layout: folder -> (id prefix, period, language)
+    FOLDERS = {
+        'classical_latin': ('latin_', 'Classical', 'la'),
+        'medieval_latin': ('medieval_', 'Medieval', 'la'),
+        'early_spanish': ('spanish_', 'Spanish', 'es')
+    }
+
+    def __init__(self, texts: Dict[str, CorpusText]):
+        self.texts = texts
+
+    @classmethod
+    def from_dir(cls, corpus_dir: Path) -> 'Corpus':
+        corpus_dir = Path(corpus_dir)
+        manifest_path = corpus_dir / cls.MANIFEST_NAME
+        texts = {}
+        if manifest_path.exists():
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            for entry in manifest['texts']:
+                entry = dict(entry, path=corpus_dir / entry['path'])
+                texts[entry['id']] = CorpusText(**entry)
+            return cls(texts)
+
+        for folder, (prefix, period, language) in cls.FOLDERS.items():
+            for text_file in (corpus_dir / folder).glob("*.txt"):
+                text_id = f"{prefix}{text_file.stem}"
+                texts[text_id] = CorpusText(text_id, period, language, text_file)
+        return cls(texts)
+
+    def filter(self, period=None, language=None, ids=None) -> 'Corpus':
+        """Sub-corpus of the texts matching every given criterion (a value or a collection)"""
+        def allowed(value, wanted):
+            if wanted is None:
+                return True
+            return value == wanted if isinstance(wanted, str) else value in wanted
+        return Corpus({text_id: text for text_id, text in self.texts.items()
+                       if allowed(text.period, period) and allowed(text.language, language)
+                       and allowed(text_id, ids)})
+
+    def load(self) -> Dict[str, TextHandle]:
+        """Lazy handles on every text, keyed by id; no file is read yet"""
+        return {text_id: text.handle() for text_id, text in self.texts.items()}
+
+    def __iter__(self) -> Iterator[CorpusText]:
+        return iter(self.texts.values())
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __contains__(self, text_id: str) -> bool:
+        return text_id in self.texts
+
+    def __getitem__(self, text_id: str) -> CorpusText:
+        return self.texts[text_id]
+
+def text_metrics(result: Dict) -> Dict[str, float]:
+    """
+    Headline per-text metrics: mean dependency depth, and article and
+    synthetic/analytic construction rates per 1000 words (the rates are
+    omitted for texts with no words). Metrics whose analyses were not run
+    (see analyze_full_corpus) are omitted too.
+    """
+    metrics = {}
+    if 'dependency_complexity' in result:
+        metrics['dependency_depth'] = result['dependency_complexity']['average_depth']
+    word_count = result.get('function_words', {}).get('word_count', 0)
+    if word_count > 0:
+        articles = sum(sum(counts.values()) for counts in result['function_words']['articles'].values())
+        metrics['article_rate'] = articles / word_count * 1000
+
+        constructions = result.get('analytical_constructions', {})
+        synthetic = sum(constructions.get(c, {}).get('synthetic', 0)
+                        for c in ['passive_voice', 'perfect_tense', 'future_tense'])
+        analytic = sum(constructions.get(c, {}).get('analytic', 0)
+                       for c in ['passive_voice', 'perfect_tense', 'future_tense'])
+        metrics['synthetic_rate'] = synthetic / word_count * 1000
+        metrics['analytic_rate'] = analytic / word_count * 1000
+    return metrics
+
+# Raw counts behind the complexity vector; all of them add up across chunks
+COMPLEXITY_COUNTS = ('words', 'sentences', 'features', 'depth_sum', 'distance_sum', 'arcs',
+                     'function_words', 'synthetic', 'analytic', 'clause_constructions')
+
+# Vector components that make up the complexity budget
+BUDGET_COMPONENTS = ('morphological_load', 'dependency_depth', 'dependency_distance',
+                     'function_word_density', 'clause_density')
+
+def complexity_vector(counts: Dict[str, int]) -> Dict[str, float]:
+    """
+    Complexity vector from the counts gathered by
+    analyze_complexity_vector: features per word, mean maximum depth per
+    sentence, mean head distance, function words, constructions and
+    clause-level constructions per word, and the analytic share of the
+    marked constructions. Rates with an empty denominator are 0.
+    """
+    def rate(numerator, denominator):
+        return numerator / denominator if denominator else 0.0
+
+    words = counts['words']
+    return {
+        'morphological_load': rate(counts['features'], words),
+        'dependency_depth': rate(counts['depth_sum'], counts['sentences']),
+        'dependency_distance': rate(counts['distance_sum'], counts['arcs']),
+        'function_word_density': rate(counts['function_words'], words),
+        'synthetic_density': rate(counts['synthetic'], words),
+        'analytic_density': rate(counts['analytic'], words),
+        'analytic_share': rate(counts['analytic'], counts['synthetic'] + counts['analytic']),
+        'clause_density': rate(counts['clause_constructions'], words)
+    }
+
+def complexity_budget(results: Dict[str, Dict]) -> pd.DataFrame:
+    """
+    One row per text with its period, complexity vector and 'budget': the
+    mean of the BUDGET_COMPONENTS z-scored across the given texts. If
+    complexity is conserved, the budget stays level across periods while
+    its components trade off. Texts without a complexity vector are left
+    out.
+    """
+    rows = {
+        text_name: {'period': period_for(text_name, result), **result['complexity_vector']['vector']}
+        for text_name, result in results.items()
+        if 'complexity_vector' in result
+    }
+    table = pd.DataFrame.from_dict(rows, orient='index')
+    if len(table):
+        components = table[list(BUDGET_COMPONENTS)]
+        spread = components.std(ddof=0).replace(0, 1)
+        table['budget'] = ((components - components.mean()) / spread).mean(axis=1)
+    return table
+
+def flatten_metrics(result: Dict, prefix: str = '') -> Dict[str, float]:
+    """
+    Every scalar in a result as a dotted metric name, e.g.
+    'function_words.total_by_type.articles'. Per-sentence lists are left
+    out; the headline text_metrics are added under their own names.
+    """
+    flat = {} if prefix else dict(text_metrics(result))
+    for key, value in result.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_metrics(value, f"{name}."))
+        elif isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+class ResultStore:
+    """
+    SQLite store of analysis results, versioned by run.
+
+    texts holds the latest result of every corpus text (as JSON) together
+    with its manifest entry: period, language, path, size, mtime, SHA-256,
+    ANALYZER_VERSION and the analysis settings. A text whose period or
+    language changed in the corpus manifest is re-analyzed, as the language
+    picks the pipeline. A text whose size and mtime are unchanged is
+    trusted without hashing; otherwise its hash decides, so touching a file
+    without editing it does not trigger a re-analysis. Each run adds a row
+    to runs and one metrics row per text x scalar metric, so consumers can
+    query numbers with plain SQL (see load_metrics) without Stanza.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            analyzer_version INTEGER NOT NULL,
+            settings TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS texts (
+            text_name TEXT PRIMARY KEY,
+            period TEXT,
+            path TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime REAL NOT NULL,
+            sha256 TEXT NOT NULL,
+            analyzer_version INTEGER NOT NULL,
+            settings TEXT NOT NULL,
+            run_id INTEGER REFERENCES runs(run_id),
+            payload TEXT NOT NULL,
+            language TEXT
+        );
+        CREATE TABLE IF NOT EXISTS metrics (
+            run_id INTEGER NOT NULL REFERENCES runs(run_id),
+            text_name TEXT NOT NULL,
+            period TEXT,
+            metric TEXT NOT NULL,
+            value REAL,
+            PRIMARY KEY (run_id, text_name, metric)
+        );
+        CREATE INDEX IF NOT EXISTS metrics_by_name ON metrics (metric, run_id);
+        CREATE TABLE IF NOT EXISTS statistics (
+            run_id INTEGER NOT NULL REFERENCES runs(run_id),
+            analysis TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            PRIMARY KEY (run_id, analysis)
+        );
+    """
+
+    def __init__(self, db_path: Path = RESULTS_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.executescript(self.SCHEMA)
+        # Stores from before texts.language get the column; their rows have
+        # no language yet, so they count as stale
+        if 'language' not in {row[1] for row in self.conn.execute("PRAGMA table_info(texts)")}:
+            self.conn.execute("ALTER TABLE texts ADD COLUMN language TEXT")
+        self.run_id = None
+        self.manifest = {}
+        for row in self.conn.execute(
+                "SELECT text_name, path, size, mtime, sha256, analyzer_version, settings, period, language "
+                "FROM texts"):
+            self.manifest[row[0]] = {
+                'path': row[1], 'size': row[2], 'mtime': row[3], 'sha256': row[4],
+                'analyzer_version': row[5], 'settings': json.loads(row[6]),
+                'period': row[7], 'language': row[8]
+            }
+
+    @staticmethod
+    def file_hash(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def begin_run(self, settings: Dict) -> int:
+        """Register a new analysis run; later metrics rows belong to it"""
+        cursor = self.conn.execute(
+            "INSERT INTO runs (analyzer_version, settings) VALUES (?, ?)",
+            (ANALYZER_VERSION, json.dumps(settings, sort_keys=True)))
+        self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def latest_run(self) -> Optional[int]:
+        return self.conn.execute("SELECT MAX(run_id) FROM runs").fetchone()[0]
+
+    def entry_for(self, path: Path, settings: Dict, period: Optional[str] = None,
+                  language: Optional[str] = None) -> Dict:
+        """Manifest entry describing the current state of a text file"""
+        st = path.stat()
+        return {
+            'period': period,
+            'language': language,
+            'path': str(path),
+            'size': st.st_size,
+            'mtime': st.st_mtime,
+            'sha256': None,
+            'analyzer_version': ANALYZER_VERSION,
+            'settings': settings
+        }
+
+    def is_current(self, text_name: str, entry: Dict) -> bool:
+        """
+        Whether the stored result for text_name still matches entry.
+
+        Fills in entry['sha256'] when the file had to be hashed.
+        """
+        stored = self.manifest.get(text_name)
+        if (stored is None
+                or stored['analyzer_version'] != entry['analyzer_version']
+                or stored['settings'] != entry['settings']
+                or stored['period'] != entry['period']
+                or stored['language'] != entry['language']):
+            return False
+        if stored['size'] == entry['size'] and stored['mtime'] == entry['mtime']:
+            entry['sha256'] = stored['sha256']
+            return True
+        entry['sha256'] = self.file_hash(Path(entry['path']))
+        if stored['sha256'] == entry['sha256']:
+            # Same content under a new mtime: keep the result, refresh the entry
+            self.conn.execute("UPDATE texts SET path = ?, size = ?, mtime = ? WHERE text_name = ?",
+                              (entry['path'], entry['size'], entry['mtime'], text_name))
+            self.manifest[text_name] = entry
+            return True
+        return False
+
+    def get(self, text_name: str) -> Optional[Dict]:
+        """Return the stored result for a text, or None if there is none"""
+        row = self.conn.execute("SELECT payload FROM texts WHERE text_name = ?", (text_name,)).fetchone()
+        if row is None:
+            return None
+        return _restore_int_keys(json.loads(row[0]))
+
+    def put(self, text_name: str, entry: Dict, result: Dict):
+        """Store a text's result and manifest entry"""
+        if entry['sha256'] is None:
+            entry['sha256'] = self.file_hash(Path(entry['path']))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO texts (text_name, period, path, size, mtime, sha256, analyzer_version, "
+            "settings, run_id, payload, language) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (text_name, entry.get('period') or period_for(text_name, result), entry['path'], entry['size'],
+             entry['mtime'], entry['sha256'], entry['analyzer_version'],
+             json.dumps(entry['settings'], sort_keys=True), self.run_id,
+             json.dumps(result, ensure_ascii=False, default=_json_default), entry.get('language')))
+        self.manifest[text_name] = entry
+
+    def record_metrics(self, results: Dict[str, Dict]):
+        """Write one metrics row per text x scalar metric for the current run"""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO metrics VALUES (?, ?, ?, ?, ?)",
+            ((self.run_id, text_name, period_for(text_name, result), metric, value)
+             for text_name, result in results.items()
+             for metric, value in flatten_metrics(result).items()))
+
+    def put_statistics(self, analyses: Dict, run_id: Optional[int] = None):
+        """Store StatisticalAnalysis raw results as JSON, one row per analysis"""
+        run_id = run_id or self.run_id or self.latest_run()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO statistics VALUES (?, ?, ?)",
+            ((run_id, analysis, json.dumps(payload, default=_json_default))
+             for analysis, payload in analyses.items()))
+        self.commit()
+
+    def prune(self, text_names):
+        """Drop results for texts that are no longer in the corpus"""
+        for text_name in set(self.manifest) - set(text_names):
+            del self.manifest[text_name]
+            self.conn.execute("DELETE FROM texts WHERE text_name = ?", (text_name,))
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+def load_results(db_path: Path = RESULTS_DB) -> Dict[str, Dict]:
+    """Latest stored result of every text, ready for StatisticalAnalysis"""
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT text_name, payload FROM texts ORDER BY rowid").fetchall()
+    return {text_name: _restore_int_keys(json.loads(payload)) for text_name, payload in rows}
+
+def load_metrics(db_path: Path = RESULTS_DB,
+                 metrics: Optional[List[str]] = None,
+                 run_id: Optional[int] = None) -> pd.DataFrame:
+    """
+    Long table of (text_name, period, metric, value) for one run, the
+    latest by default, optionally limited to the given metric names. Every
+    run records the whole corpus, filtered runs included (see
+    analyze_full_corpus).
+    """
+    query = ("SELECT text_name, period, metric, value FROM metrics "
+             "WHERE run_id = COALESCE(?, (SELECT MAX(run_id) FROM metrics))")
+    params = [run_id]
+    if metrics:
+        query += f" AND metric IN ({','.join('?' * len(metrics))})"
+        params.extend(metrics)
+    with sqlite3.connect(db_path) as conn:
+        return pd.read_sql_query(query, conn, params=params)
+
+def split_into_chunks(text: str, max_chars: int = 20000) -> Iterator[str]:
+    """
+    Split a text into chunks of at most max_chars characters.
+
+    Chunks break at paragraph boundaries where possible, then at sentence
+    punctuation, and only as a last resort at whitespace, so no token is
+    ever cut in half and word counts add up across chunks.
+    """
+    def pieces(block: str, separators) -> Iterator[str]:
+        if len(block) <= max_chars or not separators:
+            yield block
+            return
+        for part in re.split(separators[0], block):
+            yield from pieces(part, separators[1:])
+
+    separators = [r'\n\s*\n', r'(?<=[.!?;:])\s+', r'\s+']
+    chunk = []
+    size = 0
+    for piece in pieces(text, separators):
+        piece = piece.strip()
+        if not piece:
+            continue
+        if chunk and size + len(piece) + 1 > max_chars:
+            yield '\n\n'.join(chunk)
+            chunk, size = [], 0
+        chunk.append(piece)
+        size += len(piece) + 2
+    if chunk:
+        yield '\n\n'.join(chunk)
+
+def _batches(items, max_size: int, size=len) -> Iterator[List]:
+    """
+    Group items, in order, into lists whose total size stays within
+    max_size; an item larger than max_size gets a list to itself.
+    """
+    batch, batch_size = [], 0
+    for item in items:
+        item_size = size(item)
+        if batch and batch_size + item_size > max_size:
+            yield batch
+            batch, batch_size = [], 0
+        batch.append(item)
+        batch_size += item_size
+    if batch:
+        yield batch
+
+def _accumulate(total: Dict, part: Dict):
+    """
+    Add the counts in part into total, recursing into nested dicts.
+    Lists (the per-sentence metric arrays) are concatenated.
+    """
+    for key, value in part.items():
+        if isinstance(value, dict):
+            if key not in total:
+                total[key] = defaultdict(int)
+            _accumulate(total[key], value)
+        elif isinstance(value, list):
+            total.setdefault(key, []).extend(value)
+        elif isinstance(value, (int, float)):
+            total[key] = total.get(key, 0) + value
+
+# Morphological features are interned as single bits ('Tense=Fut' -> 1 << n)
+# and each distinct UD feats string is parsed into a bitmask once, so a
+# feature test is one dict lookup plus an AND. Bit positions are assigned
+# per process and must not be persisted.
+FEATURE_BITS: Dict[str, int] = {}
+_FEATS_MASKS: Dict[str, int] = {}
+
+def feature_bit(feature: str) -> int:
+    """Interned bit for a single 'Key=Value' feature"""
+    bit = FEATURE_BITS.get(feature)
+    if bit is None:
+        bit = FEATURE_BITS[feature] = 1 << len(FEATURE_BITS)
+    return bit
+
+def feats_mask(feats: Optional[str]) -> int:
+    """Bitmask for a UD feats string such as 'Case=Abl|VerbForm=Part'"""
+    if not feats:
+        return 0
+    mask = _FEATS_MASKS.get(feats)
+    if mask is None:
+        mask = 0
+        for feature in feats.split('|'):
+            key, _, values = feature.partition('=')
+            # Multi-valued features ('PronType=Int,Rel') set one bit per value
+            for value in values.split(','):
+                mask |= feature_bit(f"{key}={value}")
+        _FEATS_MASKS[feats] = mask
+    return mask
+
+TENSE_FUT = feature_bit('Tense=Fut')
+TENSE_PERF = feature_bit('Tense=Perf')
+VOICE_PASS = feature_bit('Voice=Pass')
+CASE_ABL = feature_bit('Case=Abl')
+VERBFORM_PART = feature_bit('VerbForm=Part')
+VERBFORM_GER = feature_bit('VerbForm=Ger')
+VERBFORM_INF = feature_bit('VerbForm=Inf')
+
+class SentenceIndex:
+    """
+    Per-sentence lookup tables built in one pass over the words.
+
+    words holds the words in order (position = id - 1), lower and feats
+    their lowercased forms and feats bitmasks; by_upos and by_lower map a
+    UPOS tag or lowercased form to its words, children maps a head id to its
+    dependents and child_deprels to their relation labels, and
+    following(upos)[i] is the first word with that UPOS after the word with
+    id i (None if there is none). Patterns and classifiers read these
+    instead of rescanning the sentence per token; labels caches
+    PatternSet.classify results. Use SentenceIndex.of(sentence) so every
+    analyzer of a parse shares one index, and one classification, per
+    sentence.
+    """
+    def __init__(self, sentence):
+        self.words = sentence.words
+        self.lower = []
+        self.feats = []
+        self.by_upos = defaultdict(list)
+        self.by_lower = defaultdict(list)
+        self.children = defaultdict(list)
+        self.child_deprels = defaultdict(set)
+        for word in self.words:
+            lower = word.text.lower()
+            self.lower.append(lower)
+            self.feats.append(feats_mask(word.feats))
+            self.by_upos[word.upos].append(word)
+            self.by_lower[lower].append(word)
+            self.children[word.head].append(word)
+            self.child_deprels[word.head].add(word.deprel)
+        self._following = {}
+        self.labels = {}
+
+    @classmethod
+    def of(cls, sentence) -> 'SentenceIndex':
+        """The sentence's index, built on first use and kept on the sentence"""
+        index = getattr(sentence, '_sentence_index', None)
+        if index is None:
+            index = sentence._sentence_index = cls(sentence)
+        return index
+
+    def following(self, upos: str) -> List:
+        """following[i] is the first word tagged upos after the word with id i"""
+        if upos not in self._following:
+            after = [None] * (len(self.words) + 1)
+            nearest = None
+            for position in range(len(self.words), 0, -1):
+                after[position] = nearest
+                if self.words[position - 1].upos == upos:
+                    nearest = self.words[position - 1]
+            after[0] = nearest
+            self._following[upos] = after
+        return self._following[upos]
+
+# Construction patterns: a small Semgrex-like language over UD parses.
+#
+# A node is a brace-delimited list of constraints separated by ';':
+# 'attribute:value', where attribute is upos, xpos, lemma, deprel, text or
+# lower (the lowercased form) and value lists alternatives with '|', or
+# 'feats:Case=Abl|VerbForm=Part', which requires every listed feature. A
+# leading '!' negates a constraint; {} matches any word. '=name' after a
+# node binds the matched word under that name.
+#
+# Relations follow a node and apply to it, as in Semgrex: 'A > B' (B is a
+# dependent of A; '>nsubj|obj' restricts its deprel), 'A < B' (B is the head
+# of A; '<nmod' restricts A's deprel), 'A $ B' (B is a sibling of A),
+# 'A . B' (B is the next word), 'A .. B' (B comes later), 'A ..3 B' (B is one
+# of the next 3 words), 'A ..VERB B' (B is the nearest following VERB) and
+# 'A ~ B' (B is anywhere in the sentence). Parentheses attach relations to
+# an inner node: '{upos:DET} < ({} >nsubj {})'.
+_PATTERN_TOKENS = re.compile(r"""\s*(?:
+    (?P<node>\{[^{}]*\})(?:=(?P<name>\w+))?
+  | (?P<open>\() | (?P<close>\))
+  | (?P<dependency>[<>])(?P<deprels>[\w:|]*)
+  | (?P<later>\.\.)(?P<limit>\d+|[A-Z]+)?
+  | (?P<next>\.) | (?P<sibling>\$) | (?P<anywhere>~)
+)""", re.VERBOSE)
+
+_NODE_ATTRIBUTES = ('upos', 'xpos', 'lemma', 'deprel', 'text', 'lower', 'feats')
+
+class PatternNode:
+    """One node of a compiled pattern: word constraints plus relations to other nodes"""
+    def __init__(self, spec: str, name: Optional[str] = None):
+        self.name = name
+        self.required: Dict[str, frozenset] = {}
+        self.excluded: Dict[str, frozenset] = {}
+        self.feats = 0
+        self.excluded_feats: List[int] = []
+        self.relations: List[Tuple['PatternRelation', 'PatternNode']] = []
+        for constraint in filter(None, (part.strip() for part in spec.split(';'))):
+            negated = constraint.startswith('!')
+            attribute, _, value = constraint.lstrip('!').partition(':')
+            attribute = attribute.strip()
+            if attribute not in _NODE_ATTRIBUTES or not value:
+                raise ValueError(f"Bad node constraint {constraint!r}")
+            if attribute == 'feats':
+                if negated:
+                    self.excluded_feats.append(feats_mask(value.strip()))
+                else:
+                    self.feats |= feats_mask(value.strip())
+            else:
+                values = frozenset(v.strip() for v in value.split('|'))
+                (self.excluded if negated else self.required)[attribute] = values
+
+    def test(self, word, index: SentenceIndex) -> bool:
+        """Whether a word satisfies this node's own constraints"""
+        position = word.id - 1
+        for attribute, values in self.required.items():
+            value = index.lower[position] if attribute == 'lower' else getattr(word, attribute)
+            if value not in values:
+                return False
+        for attribute, values in self.excluded.items():
+            value = index.lower[position] if attribute == 'lower' else getattr(word, attribute)
+            if value in values:
+                return False
+        mask = index.feats[position]
+        if mask & self.feats != self.feats:
+            return False
+        return not any(mask & bits == bits for bits in self.excluded_feats)
+
+    def candidates(self, index: SentenceIndex) -> List:
+        """Words that could match, in sentence order, narrowed by the form or UPOS index"""
+        if 'lower' in self.required:
+            lists = [index.by_lower.get(form, ()) for form in self.required['lower']]
+        elif 'upos' in self.required:
+            lists = [index.by_upos.get(upos, ()) for upos in self.required['upos']]
+        else:
+            return index.words
+        words = [word for words in lists for word in words]
+        return sorted(words, key=lambda word: word.id) if len(lists) > 1 else words
+
+    def match(self, word, index: SentenceIndex, binding: Dict) -> Iterator[Dict]:
+        """Every binding under which this node matches at word"""
+        if not self.test(word, index):
+            return
+        if self.name:
+            binding = {**binding, self.name: word}
+        yield from self._match_relations(0, word, index, binding)
+
+    def _match_relations(self, i: int, word, index: SentenceIndex, binding: Dict) -> Iterator[Dict]:
+        if i == len(self.relations):
+            yield binding
+            return
+        relation, target = self.relations[i]
+        for candidate in relation.candidates(word, target, index):
+            for extended in target.match(candidate, index, binding):
+                yield from self._match_relations(i + 1, word, index, extended)
+
+class PatternRelation:
+    """A relation from a pattern node to the words its target may match"""
+    def __init__(self, kind: str, deprels: Optional[frozenset] = None, limit: Optional[str] = None):
+        self.kind = kind
+        self.deprels = deprels
+        self.window = int(limit) if limit and limit.isdigit() else None
+        self.upos = limit if limit and not limit.isdigit() else None
+
+    def candidates(self, word, target: PatternNode, index: SentenceIndex) -> List:
+        if self.kind == '>':
+            return [child for child in index.children.get(word.id, ())
+                    if self.deprels is None or child.deprel in self.deprels]
+        if self.kind == '<':
+            if not word.head or (self.deprels is not None and word.deprel not in self.deprels):
+                return []
+            return [index.words[word.head - 1]]
+        if self.kind == '$':
+            return [sibling for sibling in index.children.get(word.head, ()) if sibling is not word]
+        if self.kind == '.':
+            return index.words[word.id:word.id + 1]
+        if self.kind == '..':
+            if self.upos is not None:
+                nearest = index.following(self.upos)[word.id]
+                return [nearest] if nearest is not None else []
+            if self.window is not None:
+                return index.words[word.id:word.id + self.window]
+            return index.words[word.id:]
+        return target.candidates(index)
+
+class Pattern:
+    """A compiled construction pattern; see the syntax notes above PatternNode"""
+    def __init__(self, source: str):
+        self.source = source
+        tokens = []
+        position = 0
+        source = source.strip()
+        while position < len(source):
+            token = _PATTERN_TOKENS.match(source, position)
+            if token is None or token.end() == position:
+                raise ValueError(f"Bad pattern {self.source!r} at {source[position:]!r}")
+            tokens.append(token)
+            position = token.end()
+        self.root, used = self._parse(tokens, 0)
+        if used != len(tokens):
+            raise ValueError(f"Unexpected {tokens[used].group().strip()!r} in pattern {self.source!r}")
+
+    def _parse(self, tokens: List, i: int) -> Tuple[PatternNode, int]:
+        """node (relation operand)*, where operand is a node or a parenthesised pattern"""
+        node, i = self._operand(tokens, i)
+        while i < len(tokens) and tokens[i].lastgroup not in ('node', 'name', 'open', 'close'):
+            token = tokens[i]
+            if token.group('dependency'):
+                deprels = token.group('deprels')
+                relation = PatternRelation(token.group('dependency'),
+                                           frozenset(deprels.split('|')) if deprels else None)
+            elif token.group('later'):
+                relation = PatternRelation('..', limit=token.group('limit'))
+            elif token.group('next'):
+                relation = PatternRelation('.')
+            elif token.group('sibling'):
+                relation = PatternRelation('$')
+            else:
+                relation = PatternRelation('~')
+            target, i = self._operand(tokens, i + 1)
+            node.relations.append((relation, target))
+        return node, i
+
+    def _operand(self, tokens: List, i: int) -> Tuple[PatternNode, int]:
+        if i >= len(tokens):
+            raise ValueError(f"Pattern {self.source!r} ends where a node was expected")
+        token = tokens[i]
+        if token.group('open'):
+            node, i = self._parse(tokens, i + 1)
+            if i >= len(tokens) or not tokens[i].group('close'):
+                raise ValueError(f"Unbalanced parentheses in pattern {self.source!r}")
+            return node, i + 1
+        if token.group('node'):
+            return PatternNode(token.group('node')[1:-1], token.group('name')), i + 1
+        raise ValueError(f"Expected a node at {token.group().strip()!r} in pattern {self.source!r}")
+
+    def matches(self, index: SentenceIndex) -> Iterator[Tuple[object, Dict]]:
+        """(anchor word, binding) for every match in an indexed sentence, in sentence order"""
+        for word in self.root.candidates(index):
+            for binding in self.root.match(word, index, {}):
+                yield word, binding
+
+class PatternSet:
+    """
+    Named groups of patterns matched together over each sentence.
+
+    Rules are (group, label, pattern) triples. Within a group, patterns are
+    tried in order and the first to match at a word labels it, like an
+    if/elif chain. A sentence is indexed once (SentenceIndex) and every
+    pattern then only visits the words its anchor node can match.
+    """
+    def __init__(self, rules=()):
+        self.rules: List[Tuple[str, object, Pattern]] = []
+        for group, label, source in rules:
+            self.add(group, label, source)
+
+    def add(self, group: str, label, source: str) -> Pattern:
+        pattern = Pattern(source)
+        self.rules.append((group, label, pattern))
+        return pattern
+
+    @property
+    def groups(self) -> List[str]:
+        return list(dict.fromkeys(group for group, _, _ in self.rules))
+
+    def matches(self, sentence, index: Optional[SentenceIndex] = None) -> Iterator[Tuple[str, object, Dict]]:
+        """(group, label, binding) for every match of every pattern, in rule order"""
+        index = index or SentenceIndex.of(sentence)
+        for group, label, pattern in self.rules:
+            for _, binding in pattern.matches(index):
+                yield group, label, binding
+
+    def classify(self, sentence, index: Optional[SentenceIndex] = None) -> Dict[str, Dict[int, Tuple[object, Dict]]]:
+        """
+        {group: {word id: (label, binding)}}: for each word, the first
+        pattern of each group that matches there, with its first binding
+        """
+        index = index or SentenceIndex.of(sentence)
+        labels = {group: {} for group in self.groups}
+        for group, label, pattern in self.rules:
+            found = labels[group]
+            for word in pattern.root.candidates(index):
+                if word.id not in found:
+                    binding = next(pattern.root.match(word, index, {}), None)
+                    if binding is not None:
+                        found[word.id] = (label, binding)
+        return labels
+
+    def count(self, doc: stanza.Document) -> Dict[str, Counter]:
+        """Labels per group over a Document, one classify pass per sentence"""
+        counts = {group: Counter() for group in self.groups}
+        for sent in doc.sentences:
+            for group, found in self.classify(sent).items():
+                counts[group].update(label for label, _ in found.values())
+        return counts
+
+    def anchor_forms(self, group: str) -> Optional[frozenset]:
+        """
+        Lowercased forms every match in a group is anchored on, or None if
+        some pattern in the group can anchor on any form
+        """
+        forms = set()
+        for rule_group, _, pattern in self.rules:
+            if rule_group == group:
+                if 'lower' not in pattern.root.required:
+                    return None
+                forms |= pattern.root.required['lower']
+        return frozenset(forms)
+
+# Preposition and article patterns (see PatternNode for the syntax). Labels
+# are the classifier types; unmatched prepositions are 'other', unmatched
+# Spanish determiners 'other' and Latin ones 'not_article'.
+FUNCTION_WORD_PATTERNS = [
+    # 'de' replacing the genitive
+    ('preposition', 'case_replacement', '{upos:ADP;lower:de} >nmod {}'),
+    # Spatial prepositions
+    ('preposition', 'semantic', '{upos:ADP;lower:en|sobre|bajo}'),
+    # Grammaticalized uses
+    ('preposition', 'case_replacement', '{upos:ADP;lower:a|para|por} >iobj {}'),
+    ('preposition', 'semantic', '{upos:ADP;lower:a|para|por}'),
+    # Latin prepositions (mostly semantic since it has a case system)
+    ('preposition', 'semantic', '{upos:ADP;lower:in|ad|ex|ab|cum}')
+]
+
+# Construction patterns by language. Labels are (construction, form) for
+# tense/voice constructions, binding the auxiliary and main verb of
+# analytic ones as aux and verb, and (category, strategy) for clause-level
+# constructions.
+CONSTRUCTION_PATTERNS = {
+    'la': FUNCTION_WORD_PATTERNS + [
+        ('construction', ('future_tense', 'synthetic'), '{upos:VERB;feats:Tense=Fut}'),
+        ('construction', ('perfect_tense', 'synthetic'), '{upos:VERB;feats:Tense=Perf}'),
+        ('construction', ('passive_voice', 'synthetic'), '{upos:VERB;feats:Voice=Pass}'),
+        ('clause', ('ablative_absolute', 'other'), '{feats:Case=Abl|VerbForm=Part}'),
+        ('clause', ('participial_constructions', 'other'), '{feats:VerbForm=Part}')
+    ],
+    'es': FUNCTION_WORD_PATTERNS + [
+        # Articles marking a case role: their head has a subject or object
+        ('article', 'case_marking', '{upos:DET;lower:el|la|los|las} < ({} >nsubj|obj {})'),
+        ('article', 'definiteness', '{upos:DET;lower:el|la|los|las|un|una|unos|unas}'),
+        # Auxiliary plus the nearest following main verb
+        ('construction', ('future_tense', 'analytic'),
+         '{upos:AUX;lower:ir|voy|vas|va}=aux ..VERB {}=verb ~ {lower:a}'),
+        ('construction', ('perfect_tense', 'analytic'),
+         '{upos:AUX;lower:he|has|ha|hemos}=aux ..VERB {feats:VerbForm=Part}=verb'),
+        ('construction', ('passive_voice', 'analytic'),
+         '{upos:AUX;lower:ser|es|son}=aux ..VERB {feats:VerbForm=Part}=verb'),
+        ('clause', ('subordination_strategies', 'que_clauses'), '{upos:SCONJ;lower:que}'),
+        ('clause', ('subordination_strategies', 'gerund_clauses'), '{feats:VerbForm=Ger}'),
+        ('clause', ('subordination_strategies', 'infinitive_clauses'), '{feats:VerbForm=Inf}'),
+        ('clause', ('subordination_strategies', 'relative_clauses'), '{deprel:acl:relcl}')
+    ]
+}
+
+class Vocabulary:
+    """Interns strings to dense integer codes"""
     def __init__(self):
-        self.latin_nlp = stanza.Pipeline('la')
-        self.spanish_nlp = stanza.Pipeline('es')
-        self.corpus_dir = Path("corpus")
+        self.codes: Dict[str, int] = {}
+        self.strings: List[str] = []
 
-    def load_corpus(self) -> Dict[str, str]:
-        """Load all texts from the corpus directory"""
-        corpus = {}
-    
-    # Load Classical Latin
-        latin_dir = self.corpus_dir / "classical_latin"
-        for text_file in latin_dir.glob("*.txt"):
-            with open(text_file, 'r', encoding='utf-8') as f:
-                corpus[f"latin_{text_file.stem}"] = f.read()
-    
-    # Load Medieval Latin
-        medieval_dir = self.corpus_dir / "medieval_latin"
-        for text_file in medieval_dir.glob("*.txt"):
-            with open(text_file, 'r', encoding='utf-8') as f:
-                corpus[f"medieval_{text_file.stem}"] = f.read()
-    
-    # Load Early Spanish
-        spanish_dir = self.corpus_dir / "early_spanish"
-        for text_file in spanish_dir.glob("*.txt"):
-            with open(text_file, 'r', encoding='utf-8') as f:
-                corpus[f"spanish_{text_file.stem}"] = f.read()
-    
+    def code(self, string: Optional[str]) -> int:
+        if string is None:
+            string = ''
+        code = self.codes.get(string)
+        if code is None:
+            code = self.codes[string] = len(self.strings)
+            self.strings.append(string)
+        return code
+
+    def codes_for(self, strings) -> np.ndarray:
+        """Codes of the given strings that are already interned"""
+        return np.array([self.codes[s] for s in strings if s in self.codes], dtype=np.int32)
+
+    def __getitem__(self, code: int) -> str:
+        return self.strings[code]
+
+# Shared by every TokenTable so codes are comparable across texts
+TOKEN_VOCABULARY = Vocabulary()
+
+class TokenTable:
+    """
+    Columnar, NumPy-backed view of a parsed Document.
+
+    One row per word, with sentence and word ids, head, and interned codes
+    for upos, deprel, lemma, lowercased form and feats string. Distinct
+    feats strings map to the bitmasks from feats_mask in feats_masks, which
+    keeps the column a fixed-width integer even though the corpus uses more
+    than 64 feature values. A table is a small fraction of the size of the
+    Stanza Document it was built from and supports vectorized analyses.
+    """
+    def __init__(self, sent_id: np.ndarray, word_id: np.ndarray, head: np.ndarray,
+                 upos: np.ndarray, deprel: np.ndarray, lemma: np.ndarray,
+                 form: np.ndarray, feats: np.ndarray, vocab: Vocabulary):
+        self.sent_id = sent_id
+        self.word_id = word_id
+        self.head = head
+        self.upos = upos
+        self.deprel = deprel
+        self.lemma = lemma
+        self.form = form
+        self.feats = feats
+        self.vocab = vocab
+
+        # Row offset of each sentence and each word's head row (-1 for root)
+        if len(sent_id):
+            self.sentence_starts = np.flatnonzero(np.r_[True, sent_id[1:] != sent_id[:-1]])
+            self.parent = np.where(head > 0, self.sentence_starts[sent_id] + head - 1, -1)
+        else:
+            self.sentence_starts = np.zeros(0, dtype=np.int64)
+            self.parent = np.zeros(0, dtype=np.int64)
+        self.num_sentences = len(self.sentence_starts)
+
+    @classmethod
+    def from_document(cls, doc: stanza.Document, vocab: Optional[Vocabulary] = None) -> 'TokenTable':
+        vocab = vocab or TOKEN_VOCABULARY
+        columns = defaultdict(list)
+        for sent_index, sent in enumerate(doc.sentences):
+            for word in sent.words:
+                columns['sent_id'].append(sent_index)
+                columns['word_id'].append(word.id)
+                columns['head'].append(word.head or 0)
+                columns['upos'].append(vocab.code(word.upos))
+                columns['deprel'].append(vocab.code(word.deprel))
+                columns['lemma'].append(vocab.code(word.lemma))
+                columns['form'].append(vocab.code(word.text.lower()))
+                columns['feats'].append(vocab.code(word.feats))
+        arrays = {name: np.array(columns[name], dtype=np.int32)
+                  for name in ('sent_id', 'word_id', 'head', 'upos', 'deprel', 'lemma', 'form', 'feats')}
+        return cls(vocab=vocab, **arrays)
+
+    def __len__(self) -> int:
+        return len(self.word_id)
+
+    def is_in(self, column: str, strings) -> np.ndarray:
+        """Boolean row mask: column value is one of the given strings"""
+        return np.isin(getattr(self, column), self.vocab.codes_for(strings))
+
+    def has_feature(self, bit: int) -> np.ndarray:
+        """Boolean row mask: the word's feats include the given feature bit"""
+        lookup = np.zeros(len(self.vocab.strings), dtype=bool)
+        codes = np.unique(self.feats)
+        lookup[codes] = [bool(feats_mask(self.vocab[code]) & bit) for code in codes]
+        return lookup[self.feats]
+
+    def heads_with_child(self, row_mask: np.ndarray) -> np.ndarray:
+        """
+        Boolean mask over head slots that have a dependent in row_mask.
+
+        Slots 0..n-1 are words; slot n + k stands for the root of sentence k,
+        so a mask can be indexed with head_slots.
+        """
+        slots = np.zeros(len(self) + self.num_sentences, dtype=bool)
+        slots[self.head_slots[row_mask]] = True
+        return slots
+
+    @property
+    def head_slots(self) -> np.ndarray:
+        return np.where(self.parent >= 0, self.parent, len(self) + self.sent_id)
+
+    def word_depths(self) -> np.ndarray:
+        """Depth below the root of every word, by vectorized pointer jumping"""
+        depths = np.zeros(len(self), dtype=np.int32)
+        current = self.parent.copy()
+        active = current >= 0
+        while active.any():
+            depths[active] += 1
+            current[active] = self.parent[current[active]]
+            active = current >= 0
+        return depths
+
+    def count_forms(self, row_mask: np.ndarray, column: str = 'form') -> Dict[str, int]:
+        """Counts of a column's strings over the masked rows"""
+        codes, counts = np.unique(getattr(self, column)[row_mask], return_counts=True)
+        return {self.vocab[code]: int(count) for code, count in zip(codes, counts)}
+
+def _sketch_hashes(key: str) -> Tuple[int, int]:
+    """Two 64-bit hashes of a key, stable across processes and runs (blake2b)"""
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+
+def _entropy(counts, total: int) -> float:
+    """Shannon entropy in bits of the frequencies in counts out of total"""
+    counts = np.asarray(list(counts), dtype=float)
+    counts = counts[counts > 0]
+    if not total or not len(counts):
+        return 0.0
+    p = counts / total
+    return float(-(p * np.log2(p)).sum())
+
+class ExactCounter:
+    """Exact key frequencies (a Counter); the reference for FrequencySketch"""
+    def __init__(self):
+        self.counts = Counter()
+        self.total = 0
+
+    def add(self, key: str, count: int = 1):
+        self.counts[key] += count
+        self.total += count
+
+    def merge(self, other: 'ExactCounter'):
+        self.counts.update(other.counts)
+        self.total += other.total
+
+    def distinct(self) -> float:
+        return float(len(self.counts))
+
+    def entropy(self) -> float:
+        return _entropy(self.counts.values(), self.total)
+
+class CountMinSketch:
+    """
+    Count-Min sketch: depth rows of width counters. Estimates never
+    undercount and overcount by at most about e/width of the total with
+    probability 1 - exp(-depth).
+    """
+    def __init__(self, width: int = 1 << 16, depth: int = 4):
+        self.width = width
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    def _cells(self, hashes: Tuple[int, int]) -> List[int]:
+        # Double hashing; an odd step never cycles back to the same cell early
+        h1, h2 = hashes
+        h2 |= 1
+        return [(h1 + row * h2) % self.width for row in range(len(self.table))]
+
+    def add(self, hashes: Tuple[int, int], count: int = 1) -> int:
+        """Count a key and return its updated estimate"""
+        estimate = None
+        for row, cell in zip(self.table, self._cells(hashes)):
+            row[cell] += count
+            if estimate is None or row[cell] < estimate:
+                estimate = row[cell]
+        return int(estimate)
+
+    def estimate(self, hashes: Tuple[int, int]) -> int:
+        return int(min(row[cell] for row, cell in zip(self.table, self._cells(hashes))))
+
+    def merge(self, other: 'CountMinSketch'):
+        if self.table.shape != other.table.shape:
+            raise ValueError("Cannot merge Count-Min sketches of different sizes")
+        self.table += other.table
+
+class HyperLogLog:
+    """HyperLogLog distinct counter with 2**precision registers (~1.04 / sqrt(2**precision) error)"""
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, hash64: int):
+        index = hash64 >> (64 - self.precision)
+        rest = hash64 & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> float:
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.ldexp(1.0, -self.registers.astype(int)).sum()
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # Linear counting is more accurate while many registers are empty
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return float(estimate)
+
+    def merge(self, other: 'HyperLogLog'):
+        if self.precision != other.precision:
+            raise ValueError("Cannot merge HyperLogLogs of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+class FrequencySketch:
+    """
+    Bounded-memory counterpart of ExactCounter.
+
+    A Count-Min sketch estimates frequencies, a HyperLogLog counts distinct
+    keys, and the heavy_hitters most frequent keys are kept by name (a
+    min-heap of their Count-Min estimates). Entropy is computed exactly over
+    the heavy hitters, with the remaining mass assumed to be spread evenly
+    over the remaining distinct keys; with fewer distinct keys than
+    heavy_hitters it is exact up to Count-Min overcounting. Memory is fixed
+    by width, depth, precision and heavy_hitters, whatever the corpus size.
+    """
+    def __init__(self, width: int = 1 << 16, depth: int = 4, precision: int = 14,
+                 heavy_hitters: int = 1000):
+        self.cms = CountMinSketch(width, depth)
+        self.hll = HyperLogLog(precision)
+        self.capacity = heavy_hitters
+        self.heavy: Dict[str, int] = {}
+        # (estimate, key) for every heavy hitter; estimates may be stale
+        # (too low) and are refreshed when the entry reaches the top
+        self._heap: List[Tuple[int, str]] = []
+        self.total = 0
+
+    def add(self, key: str, count: int = 1):
+        hashes = _sketch_hashes(key)
+        self.total += count
+        estimate = self.cms.add(hashes, count)
+        self.hll.add(hashes[0])
+        self._offer(key, estimate)
+
+    def _offer(self, key: str, estimate: int):
+        if key in self.heavy:
+            self.heavy[key] = estimate
+            return
+        if len(self.heavy) < self.capacity:
+            self.heavy[key] = estimate
+            heapq.heappush(self._heap, (estimate, key))
+            return
+
+        # Refresh stale entries until the top of the heap is the true minimum
+        while self._heap[0][0] != self.heavy[self._heap[0][1]]:
+            victim = self._heap[0][1]
+            heapq.heapreplace(self._heap, (self.heavy[victim], victim))
+        smallest, victim = self._heap[0]
+        if estimate > smallest:
+            heapq.heapreplace(self._heap, (estimate, key))
+            del self.heavy[victim]
+            self.heavy[key] = estimate
+
+    def merge(self, other: 'FrequencySketch'):
+        self.cms.merge(other.cms)
+        self.hll.merge(other.hll)
+        self.total += other.total
+        # Re-rank the union of both heavy-hitter sets against the merged counts
+        candidates = set(self.heavy) | set(other.heavy)
+        estimates = {key: self.cms.estimate(_sketch_hashes(key)) for key in candidates}
+        top = heapq.nlargest(self.capacity, estimates.items(), key=lambda item: item[1])
+        self.heavy = dict(top)
+        self._heap = [(estimate, key) for key, estimate in top]
+        heapq.heapify(self._heap)
+
+    def distinct(self) -> float:
+        return max(self.hll.count(), float(len(self.heavy)))
+
+    def entropy(self) -> float:
+        if not self.total:
+            return 0.0
+        # Count-Min overcounts, so the heavy mass is capped at the total
+        heavy = []
+        mass = 0
+        for count in sorted(self.heavy.values(), reverse=True):
+            count = min(count, self.total - mass)
+            if count <= 0:
+                break
+            heavy.append(count)
+            mass += count
+        entropy = _entropy(heavy, self.total)
+
+        tail = self.total - mass
+        if tail > 0:
+            tail_types = max(self.distinct() - len(heavy), 1.0)
+            p = tail / self.total
+            entropy -= p * math.log2(p / tail_types)
+        return entropy
+
+class MorphologyAccumulator:
+    """
+    Streaming word-form and lemma statistics for morphological richness.
+
+    Words are fed one at a time (add, or add_document for a whole parse)
+    into three frequency stores: forms, lemmas and (lemma, form) pairs.
+    mode 'exact' keeps ExactCounters; 'sketch' keeps fixed-size
+    FrequencySketches (sketch_params are passed on to them) for corpora
+    whose vocabulary does not fit in memory. Accumulators of the same mode
+    and size merge, so chunks, texts and worker results can be measured
+    separately and combined.
+    """
+    MODES = {'exact': ExactCounter, 'sketch': FrequencySketch}
+
+    def __init__(self, mode: str = 'exact', **sketch_params):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown mode {mode!r}; expected one of {sorted(self.MODES)}")
+        store = self.MODES[mode]
+        self.mode = mode
+        self.forms = store(**sketch_params)
+        self.lemmas = store(**sketch_params)
+        self.pairs = store(**sketch_params)
+
+    def add(self, form: str, lemma: Optional[str] = None):
+        """Count one word; a word without a lemma is its own lemma"""
+        form = form.lower()
+        lemma = (lemma or form).lower()
+        self.forms.add(form)
+        self.lemmas.add(lemma)
+        self.pairs.add(f"{lemma}\t{form}")
+
+    def add_document(self, doc: stanza.Document):
+        """Count every word of a parse, skipping punctuation"""
+        for sent in doc.sentences:
+            for word in sent.words:
+                if word.upos != 'PUNCT':
+                    self.add(word.text, word.lemma)
+
+    def merge(self, other: 'MorphologyAccumulator') -> 'MorphologyAccumulator':
+        if other.mode != self.mode:
+            raise ValueError(f"Cannot merge a {other.mode} accumulator into a {self.mode} one")
+        self.forms.merge(other.forms)
+        self.lemmas.merge(other.lemmas)
+        self.pairs.merge(other.pairs)
+        return self
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Token and type counts, form and lemma entropy (bits), the
+        conditional entropy of the form given the lemma, H(F|L) = H(L,F) -
+        H(L), and the mean number of distinct forms per lemma
+        """
+        lemma_types = self.lemmas.distinct()
+        return {
+            'tokens': self.forms.total,
+            'form_types': self.forms.distinct(),
+            'lemma_types': lemma_types,
+            'form_entropy': self.forms.entropy(),
+            'lemma_entropy': self.lemmas.entropy(),
+            'conditional_entropy': max(self.pairs.entropy() - self.lemmas.entropy(), 0.0),
+            'forms_per_lemma': self.pairs.distinct() / lemma_types if lemma_types else 0.0
+        }
+
+# Stanza processors in pipeline order
+PROCESSOR_ORDER = ('tokenize', 'mwt', 'pos', 'lemma', 'depparse')
+
+class EnhancedComplexityTracker:
+    # Stanza processors each analysis reads from the parse. UPOS and feats
+    # come from pos; heads and deprels need depparse, which in turn requires
+    # lemma. mwt splits Spanish contractions (del, al) and is ignored by
+    # Stanza for languages without a multi-word token model.
+    ANALYSIS_PROCESSORS = {
+        'analytical_constructions': ('tokenize', 'mwt', 'pos'),
+        'function_words': ('tokenize', 'mwt', 'pos', 'lemma', 'depparse'),
+        'dependency_complexity': ('tokenize', 'mwt', 'pos', 'lemma', 'depparse'),
+        'clause_transformations': ('tokenize', 'mwt', 'pos', 'lemma', 'depparse'),
+        'complexity_vector': ('tokenize', 'mwt', 'pos', 'lemma', 'depparse')
+    }
+
+    # Analyses that can run on a prescreened parse in two-stage mode
+    PRESCREENED_ANALYSES = ('analytical_constructions',)
+
+    # Stanza batch sizes for bulk parsing. pos and depparse batch by word
+    # count, so many short documents bulk processed together share forward
+    # passes instead of each running a mostly empty batch
+    BATCH_SIZES = {
+        'tokenize_batch_size': 64,
+        'pos_batch_size': 5000,
+        'lemma_batch_size': 200,
+        'depparse_batch_size': 5000
+    }
+
+    def __init__(self, cache_dir: Optional[Path] = PARSE_CACHE_DIR,
+                 cache_max_bytes: int = 2 * 1024 ** 3,
+                 processors: Optional[str] = None,
+                 results_db: Optional[Path] = RESULTS_DB,
+                 batch_sizes: Optional[Dict[str, int]] = None,
+                 bulk_chars: int = 200000,
+                 two_stage: bool = False,
+                 corpus_dir: Path = CORPUS_DIR):
+        # Pipelines are built lazily per (language, processors) on first use.
+        # processors overrides the per-analysis processor selection; by
+        # default each run builds the cheapest pipeline its analyses need
+        self.processors = processors
+        self._pipelines = {}
+        self.corpus_dir = Path(corpus_dir)
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        # Pass cache_dir=None to always re-parse
+        self.parse_cache = ParseCache(cache_dir, cache_max_bytes) if cache_dir is not None else None
+        # Results store reused by analyze_full_corpus; None to re-analyze everything
+        self.results_db = results_db
+        self.batch_sizes = dict(self.BATCH_SIZES if batch_sizes is None else batch_sizes)
+        # Characters of text handed to one bulk_process call by parse_many
+        self.bulk_chars = bulk_chars
+        # Run PRESCREENED_ANALYSES on Spanish texts in two stages (see
+        # analyze_analytical_constructions)
+        self.two_stage = two_stage
+        # Construction patterns per language; add rules here to have the
+        # analyzers' single pass over each sentence pick them up
+        self.patterns = {language: PatternSet(rules) for language, rules in CONSTRUCTION_PATTERNS.items()}
+
+    def get_pipeline(self, language: str, processors: Optional[str] = None,
+                     pretokenized: bool = False) -> stanza.Pipeline:
+        """
+        Return the Stanza pipeline for a language, building it on first use.
+        A pretokenized pipeline takes lists of sentence tokens instead of text.
+        """
+        import stanza
+        processors = processors or self.processors
+        key = (language, processors, pretokenized)
+        if key not in self._pipelines:
+            options = dict(self.batch_sizes)
+            if pretokenized:
+                options['tokenize_pretokenized'] = True
+            if processors:
+                self._pipelines[key] = stanza.Pipeline(language, processors=processors, **options)
+            else:
+                self._pipelines[key] = stanza.Pipeline(language, **options)
+        return self._pipelines[key]
+
+    def processors_for(self, analyses) -> Optional[str]:
+        """Smallest processor list covering the union of the given analyses"""
+        if self.processors:
+            return self.processors
+        needed = set()
+        for analysis in analyses:
+            needed.update(self.ANALYSIS_PROCESSORS[analysis])
+        return ','.join(p for p in PROCESSOR_ORDER if p in needed)
+
+    @property
+    def latin_nlp(self) -> stanza.Pipeline:
+        return self.get_pipeline('la')
+
+    @property
+    def spanish_nlp(self) -> stanza.Pipeline:
+        return self.get_pipeline('es')
+
+    def corpus(self, period=None, language=None) -> Corpus:
+        """The corpus under corpus_dir, optionally filtered by period and/or language"""
+        corpus = Corpus.from_dir(self.corpus_dir)
+        if period is not None or language is not None:
+            corpus = corpus.filter(period=period, language=language)
         return corpus
 
+    def load_corpus(self, period=None, language=None) -> Dict[str, TextHandle]:
+        """
+        Load all texts from the corpus directory as lazy TextHandles; use
+        .read() (or str()) for the whole text. The analyzers take them as
+        they are (see _parse).
+        """
+        return self.corpus(period, language).load()
+
+    def _parse(self, text: str, language: str, processors: Optional[str] = None) -> stanza.Document:
+        """
+        Run the language's Stanza pipeline over a text, using the parse cache.
+
+        The pipeline is only built on a cache miss, so fully cached runs
+        never load a model. text may be a TextHandle, which is decoded
+        here, so every analyze_* method accepts the values of load_corpus.
+        """
+        if isinstance(text, TextHandle):
+            text = text.read()
+        processors = processors or self.processors
+        pipeline_language = 'la' if language == 'la' else 'es'
+        if self.parse_cache is None:
+            return self.get_pipeline(pipeline_language, processors)(text)
+
+        key = self.parse_cache.key(text, language, processors or 'default')
+        doc = self.parse_cache.get(key, text)
+        if doc is None:
+            doc = self.get_pipeline(pipeline_language, processors)(text)
+            self.parse_cache.put(key, doc)
+        return doc
+
+    def _parse_pretokenized(self, sentences: List[List[str]], language: str,
+                            processors: str) -> stanza.Document:
+        """
+        Run a pretokenized pipeline over already tokenized sentences, using
+        the parse cache (keyed on the tokens, one sentence per line)
+        """
+        pipeline_language = 'la' if language == 'la' else 'es'
+        if self.parse_cache is None:
+            return self.get_pipeline(pipeline_language, processors, pretokenized=True)(sentences)
+
+        text = '\n'.join(' '.join(tokens) for tokens in sentences)
+        key = self.parse_cache.key(text, language, f"pretokenized:{processors}")
+        doc = self.parse_cache.get(key, text)
+        if doc is None:
+            doc = self.get_pipeline(pipeline_language, processors, pretokenized=True)(sentences)
+            self.parse_cache.put(key, doc)
+        return doc
+
+    def _prescreened_sentences(self, text: str, language: str) -> Tuple[List, int]:
+        """
+        Sentences of a text, POS tagged only where an analytic construction
+        is possible.
+
+        Stage one runs tokenize (and mwt) over the whole text. Only
+        sentences containing one of the auxiliary forms the construction
+        patterns are anchored on go through stage two, a pretokenized
+        tokenize,pos pipeline run once over all of them; every other
+        sentence is returned untagged, as no construction can match it.
+        Returns the sentences in text order and the number that were tagged.
+        """
+        sentences = list(self._parse(text, language, 'tokenize,mwt').sentences)
+        anchors = self.patterns['es'].anchor_forms('construction')
+        candidates = [i for i, sent in enumerate(sentences)
+                      if anchors is None or any(word.text.lower() in anchors for word in sent.words)]
+        if candidates:
+            tagged = self._parse_pretokenized([[word.text for word in sentences[i].words] for i in candidates],
+                                              language, 'tokenize,pos')
+            for i, sent in zip(candidates, tagged.sentences):
+                sentences[i] = sent
+        return sentences, len(candidates)
 
-    def analyze_analytical_constructions(self, text: str, language: str) -> Dict:
-        """Track multi-word expressions that replace single morphological markers"""
-        nlp = self.latin_nlp if language == 'la' else self.spanish_nlp
-        doc = nlp(text)
+    def parse_many(self, texts: List[str], language: str,
+                   processors: Optional[str] = None) -> List[stanza.Document]:
+        """
+        Parse many texts of one language, batching them through bulk_process.
+
+        Cache hits are served first. The misses are grouped into batches of
+        about bulk_chars characters (a longer text gets a batch to itself),
+        each batch goes through a single bulk_process call, and the
+        Documents are scattered back to their texts, cached, and returned in
+        input order. TextHandles are decoded first.
+        """
+        import stanza
+        texts = [text.read() if isinstance(text, TextHandle) else text for text in texts]
+        processors = processors or self.processors
+        pipeline_language = 'la' if language == 'la' else 'es'
+        docs = [None] * len(texts)
+        keys = [None] * len(texts)
+        misses = []
+        for i, text in enumerate(texts):
+            if self.parse_cache is not None:
+                keys[i] = self.parse_cache.key(text, language, processors or 'default')
+                docs[i] = self.parse_cache.get(keys[i], text)
+            if docs[i] is None:
+                misses.append(i)
+
+        for batch in _batches(misses, self.bulk_chars, size=lambda i: len(texts[i])):
+            pipeline = self.get_pipeline(pipeline_language, processors)
+            parsed = pipeline.bulk_process([stanza.Document([], text=texts[i]) for i in batch])
+            for i, doc in zip(batch, parsed):
+                docs[i] = doc
+                if self.parse_cache is not None:
+                    self.parse_cache.put(keys[i], doc)
+        return docs
+
+    def analyze_analytical_constructions(self, text: str, language: str,
+                                         doc: Optional[stanza.Document] = None,
+                                         two_stage: bool = False) -> Dict:
+        """
+        Track multi-word expressions that replace single morphological markers.
+
+        With two_stage, a Spanish text without a parse is tokenized and only
+        the sentences that can hold an analytic construction are POS tagged
+        (see _prescreened_sentences). The counts are the same; the result
+        gains a 'prescreen' entry with the sentence and token counts of the
+        tokenize stage and the number of sentences tagged.
+        """
+        prescreen = None
+        if two_stage and doc is None and language == 'es':
+            sentences, tagged = self._prescreened_sentences(text, language)
+            prescreen = {
+                'sentences': len(sentences),
+                'tokens': sum(len(sent.words) for sent in sentences),
+                'tagged_sentences': tagged
+            }
+        else:
+            if doc is None:
+                doc = self._parse(text, language, self.processors_for(('analytical_constructions',)))
+            sentences = doc.sentences
         
         analytical_forms = {
             'future_tense': {
@@ -66,106 +1752,74 @@ class EnhancedComplexityTracker:
                 'synthetic': 0,    # amaret
                 'analytic': 0,     # amaría
                 'components': defaultdict(int)
+            },
+            # Per-sentence construction counts, for windowed trajectories
+            'sentence_metrics': {
+                'synthetic_constructions': [],
+                'analytic_constructions': []
             }
         }
+        constructions = [forms for forms in analytical_forms.values() if 'synthetic' in forms]
+        if prescreen is not None:
+            analytical_forms['prescreen'] = prescreen
         
-        for sent in doc.sentences:
-            for word in sent.words:
-                # Check for synthetic forms in Latin
-                if language == 'la' and word.upos == 'VERB':
-                    if 'Tense=Fut' in (word.feats or ''):
-                        analytical_forms['future_tense']['synthetic'] += 1
-                    elif 'Tense=Perf' in (word.feats or ''):
-                        analytical_forms['perfect_tense']['synthetic'] += 1
-                    elif 'Voice=Pass' in (word.feats or ''):
-                        analytical_forms['passive_voice']['synthetic'] += 1
-                
-                # Check for analytical forms in Spanish
-                if language == 'es':
-                    if word.upos == 'AUX':
-                        next_verb = self._find_next_verb(sent, word)
-                        if next_verb:
-                            construction = self._identify_analytical_construction(word, next_verb)
-                            if construction:
-                                analytical_forms[construction]['analytic'] += 1
-                                analytical_forms[construction]['components'][word.text.lower()] += 1
-                                analytical_forms[construction]['components'][next_verb.text.lower()] += 1
+        for sent in sentences:
+            synthetic_before = sum(forms['synthetic'] for forms in constructions)
+            analytic_before = sum(forms['analytic'] for forms in constructions)
+            labels = self._sentence_labels(sent, language)
+            for (construction, form), binding in labels['construction'].values():
+                analytical_forms[construction][form] += 1
+                if 'verb' in binding:
+                    analytical_forms[construction]['components'][binding['aux'].text.lower()] += 1
+                    analytical_forms[construction]['components'][binding['verb'].text.lower()] += 1
+
+            analytical_forms['sentence_metrics']['synthetic_constructions'].append(
+                sum(forms['synthetic'] for forms in constructions) - synthetic_before)
+            analytical_forms['sentence_metrics']['analytic_constructions'].append(
+                sum(forms['analytic'] for forms in constructions) - analytic_before)
         
         return analytical_forms
 
-    def _classify_preposition(self, prep_word, sentence) -> str:
+    def _sentence_labels(self, sentence, language: str,
+                         index: Optional[SentenceIndex] = None) -> Dict[str, Dict[int, Tuple]]:
         """
-        Classify preposition usage type
+        The language's PatternSet.classify result for a sentence, cached on
+        its SentenceIndex (see SentenceIndex.of) so every analyzer shares
+        one matching pass
         """
-        try:
-            # For Spanish
-            if prep_word.text.lower() == 'de':
-                # Check if it's replacing genitive
-                for word in sentence.words:
-                    if word.head == prep_word.id and word.deprel == 'nmod':
-                        return 'case_replacement'
-            elif prep_word.text.lower() in ['en', 'sobre', 'bajo']:
-                return 'semantic'  # Spatial prepositions
-            elif prep_word.text.lower() in ['a', 'para', 'por']:
-                # Check for grammaticalized uses
-                if any(w.deprel == 'iobj' and w.head == prep_word.id for w in sentence.words):
-                    return 'case_replacement'
-                return 'semantic'
-            
-            # For Latin (mostly semantic since it has case system)
-            if prep_word.text.lower() in ['in', 'ad', 'ex', 'ab', 'cum']:
-                return 'semantic'
-                
-            return 'other'  # Default case
-        except Exception as e:
-            print(f"Error in _classify_preposition: {e}")
-            return 'other'
+        if index is None:
+            index = SentenceIndex.of(sentence)
+        key = 'la' if language == 'la' else 'es'
+        if key not in index.labels:
+            index.labels[key] = self.patterns[key].classify(sentence, index)
+        return index.labels[key]
+
+    def _classify_preposition(self, prep_word, sentence, index: Optional[SentenceIndex] = None,
+                              language: str = 'es') -> str:
+        """
+        Classify preposition usage type (see FUNCTION_WORD_PATTERNS)
+        """
+        found = self._sentence_labels(sentence, language, index)['preposition'].get(prep_word.id)
+        return found[0] if found else 'other'
         
-    def _classify_article(self, det_word, sentence, language: str) -> str:
+    def _classify_article(self, det_word, sentence, language: str,
+                          index: Optional[SentenceIndex] = None) -> str:
         """
         Classify article usage type - only applies to Spanish as Latin has no articles
         """
         # Latin has no articles - all DET tags should be ignored for article analysis
         if language == 'la':
             return 'not_article'
-        
-        # Spanish articles only
-        if language == 'es':
-            if det_word.text.lower() in ['el', 'la', 'los', 'las']:
-                # Check if it's marking case role
-                if any(w.deprel in ['nsubj', 'obj'] and w.head == det_word.head for w in sentence.words):
-                    return 'case_marking'
-                return 'definiteness'
-            elif det_word.text.lower() in ['un', 'una', 'unos', 'unas']:
-                return 'definiteness'
-    
-        return 'other'
-
-
-    def _find_next_verb(self, sentence, aux_word) -> Optional[stanza.models.common.doc.Word]:
-        """Find the main verb that follows an auxiliary"""
-        for word in sentence.words[aux_word.id:]:  # Start from auxiliary position
-            if word.upos == 'VERB':
-                return word
-        return None
-
-    def _identify_analytical_construction(self, aux_word, main_verb) -> Optional[str]:
-        """Identify the type of analytical construction"""
-        aux_text = aux_word.text.lower()
-        verb_feats = main_verb.feats or ''
-        
-        if aux_text in ['ir', 'voy', 'vas', 'va'] and 'a' in [w.text.lower() for w in aux_word.sent.words]:
-            return 'future_tense'
-        elif aux_text in ['he', 'has', 'ha', 'hemos'] and 'VerbForm=Part' in verb_feats:
-            return 'perfect_tense'
-        elif aux_text in ['ser', 'es', 'son'] and 'VerbForm=Part' in verb_feats:
-            return 'passive_voice'
-        return None
-
-    def analyze_function_words(self, text: str, language: str) -> Dict:
+        found = self._sentence_labels(sentence, language, index)['article'].get(det_word.id)
+        return found[0] if found else 'other'
+
+    def analyze_function_words(self, text: str, language: str,
+                               doc: Optional[stanza.Document] = None) -> Dict:
         """Detailed function word analysis"""
-        nlp = self.latin_nlp if language == 'la' else self.spanish_nlp
-        doc = nlp(text)
+        if isinstance(doc, TokenTable):
+            return self._function_words_from_table(doc, language)
+        if doc is None:
+            doc = self._parse(text, language, self.processors_for(('function_words',)))
         
         metrics = {
             'prepositions': {
@@ -184,22 +1838,29 @@ class EnhancedComplexityTracker:
                 'subordination': defaultdict(int)
             },
             'total_by_type': defaultdict(int),
-            'word_count': 0  # Add total word count for proper normalization
+            'word_count': 0,  # Add total word count for proper normalization
+            # Per-sentence arrays for sentence-level resampling
+            'sentence_metrics': {
+                'tokens': [],
+                'articles': []
+            }
         }
         
         try:
             for sent in doc.sentences:
+                index = SentenceIndex.of(sent)
+                articles_before = metrics['total_by_type'].get('articles', 0)
                 for word in sent.words:
                     # Count all words for normalization
                     metrics['word_count'] += 1
                     
                     if word.upos == 'ADP':  # Prepositions
-                        prep_type = self._classify_preposition(word, sent)
+                        prep_type = self._classify_preposition(word, sent, index, language)
                         metrics['prepositions'][prep_type][word.text.lower()] += 1
                         metrics['total_by_type']['prepositions'] += 1
                     
                     elif word.upos == 'DET':  # Articles
-                        art_type = self._classify_article(word, sent, language)
+                        art_type = self._classify_article(word, sent, language, index)
                         # Only count actual articles, not Latin determiners
                         if art_type != 'not_article':
                             metrics['articles'][art_type][word.text.lower()] += 1
@@ -209,14 +1870,21 @@ class EnhancedComplexityTracker:
                         conj_type = 'coordination' if word.upos == 'CCONJ' else 'subordination'
                         metrics['conjunctions'][conj_type][word.text.lower()] += 1
                         metrics['total_by_type']['conjunctions'] += 1
+
+                metrics['sentence_metrics']['tokens'].append(len(sent.words))
+                metrics['sentence_metrics']['articles'].append(
+                    metrics['total_by_type'].get('articles', 0) - articles_before)
         except Exception as e:
             print(f"Error in analyze_function_words: {e}")
             
         return metrics  
-    def analyze_dependency_complexity(self, text: str, language: str) -> Dict:
+    def analyze_dependency_complexity(self, text: str, language: str,
+                                      doc: Optional[stanza.Document] = None) -> Dict:
         """More sophisticated dependency analysis"""
-        nlp = self.latin_nlp if language == 'la' else self.spanish_nlp
-        doc = nlp(text)
+        if isinstance(doc, TokenTable):
+            return self._dependency_complexity_from_table(doc)
+        if doc is None:
+            doc = self._parse(text, language, self.processors_for(('dependency_complexity',)))
         
         metrics = {
             'path_lengths': [],
@@ -228,55 +1896,301 @@ class EnhancedComplexityTracker:
             },
             'dependency_distances': defaultdict(int),
             'average_depth': 0.0,
-            'max_depth': 0
+            'average_path_length': 0.0,
+            'max_depth': 0,
+            # Per-sentence arrays for sentence-level resampling
+            'sentence_metrics': {
+                'depth': [],
+                'mean_distance': []
+            }
+        }
+        
+        for sent in doc.sentences:
+            distance_sum = 0
+            arcs = 0
+            # Track path lengths and distances
+            for word in sent.words:
+                if word.head != 0:  # Not root
+                    distance = abs(word.id - word.head)
+                    metrics['dependency_distances'][distance] += 1
+                    distance_sum += distance
+                    arcs += 1
+                    
+                    # Classify dependency types
+                    if word.deprel in ['nsubj', 'obj', 'iobj', 'ccomp']:
+                        metrics['dependency_types']['argument_structure'][word.deprel] += 1
+                    elif word.deprel in ['amod', 'advmod', 'nmod']:
+                        metrics['dependency_types']['modification'][word.deprel] += 1
+                    elif word.deprel in ['conj', 'cc']:
+                        metrics['dependency_types']['coordination'][word.deprel] += 1
+            
+            # Calculate embedding depth and mean root path length
+            word_depths = self._calculate_word_depths(sent)
+            depth = max(word_depths, default=0)
+            metrics['embedding_depth'].append(depth)
+            metrics['max_depth'] = max(metrics['max_depth'], depth)
+            if word_depths:
+                metrics['path_lengths'].append(sum(word_depths) / len(word_depths))
+            metrics['sentence_metrics']['depth'].append(depth)
+            metrics['sentence_metrics']['mean_distance'].append(distance_sum / arcs if arcs else 0.0)
+        
+        if metrics['embedding_depth']:
+            metrics['average_depth'] = sum(metrics['embedding_depth']) / len(metrics['embedding_depth'])
+        if metrics['path_lengths']:
+            metrics['average_path_length'] = sum(metrics['path_lengths']) / len(metrics['path_lengths'])
+        
+        return metrics
+
+    def _calculate_word_depths(self, sentence) -> List[int]:
+        """Depth below the root of every word in a sentence, in word order"""
+        return list(self._iter_word_depths(sentence))
+
+    def _iter_word_depths(self, sentence) -> Iterator[int]:
+        """
+        Depth below the root of each word in a sentence, yielded in word
+        order so callers can fold it into their own pass over the words.
+
+        Depths are memoized as they are found, so each arc is followed once
+        and the whole sentence costs O(n) instead of one root walk per word.
+        """
+        words = sentence.words
+        depths = [-1] * len(words)
+        
+        for start in range(len(words)):
+            # Climb until we reach the root or a word with a known depth
+            path = []
+            current = start
+            while depths[current] < 0 and words[current].head != 0:
+                path.append(current)
+                current = words[current].head - 1
+            if depths[current] < 0:
+                depths[current] = 0
+            
+            depth = depths[current]
+            for index in reversed(path):
+                depth += 1
+                depths[index] = depth
+            yield depths[start]
+
+    def _calculate_dependency_depth(self, sentence) -> int:
+        """Calculate maximum dependency depth in a sentence"""
+        return max(self._calculate_word_depths(sentence), default=0)
+
+    def track_clause_transformations(self, text: str, language: str,
+                                     doc: Optional[stanza.Document] = None) -> Dict:
+        """Track how Latin constructions transform in Spanish"""
+        if isinstance(doc, TokenTable):
+            return self._clause_transformations_from_table(doc, language)
+        if doc is None:
+            doc = self._parse(text, language, self.processors_for(('clause_transformations',)))
+        
+        transformations = {
+            'ablative_absolute': {
+                'temporal_clause': 0,
+                'causal_clause': 0,
+                'gerund': 0,
+                'other': defaultdict(int)
+            },
+            'participial_constructions': {
+                'relative_clause': 0,
+                'finite_verb': 0,
+                'other': defaultdict(int)
+            },
+            'subordination_strategies': {
+                'que_clauses': 0,
+                'gerund_clauses': 0,
+                'infinitive_clauses': 0,
+                'relative_clauses': 0
+            }
+        }
+        
+        for sent in doc.sentences:
+            if language == 'la':
+                self._analyze_latin_constructions(sent, transformations)
+            else:
+                self._analyze_spanish_constructions(sent, transformations)
+        
+        return transformations
+
+    def _analyze_latin_constructions(self, sentence, metrics: Dict):
+        """Analyze Latin-specific constructions"""
+        for (category, strategy), _ in self._sentence_labels(sentence, 'la')['clause'].values():
+            metrics[category][strategy]['found'] += 1
+
+    def _analyze_spanish_constructions(self, sentence, metrics: Dict):
+        """Analyze Spanish-specific constructions"""
+        for (category, strategy), _ in self._sentence_labels(sentence, 'es')['clause'].values():
+            metrics[category][strategy] += 1
+
+    def analyze_complexity_vector(self, text: str, language: str,
+                                  doc: Optional[stanza.Document] = None) -> Dict:
+        """
+        Per-text complexity vector from a single traversal of the parse.
+
+        Each word is visited once and feeds every subsystem together: its
+        depth below the root, its morphological feature count, its distance
+        to its head, whether it is a function word (preposition, article or
+        conjunction) and whether it marks a synthetic/analytic construction
+        or a clause-level construction, by the same rules as the separate
+        analyzers. The construction and article labels are looked up in the
+        sentence's PatternSet.classify result, which is computed once per
+        sentence and shared with the other analyzers (see
+        SentenceIndex.of). Returns
+        the raw 'counts', which add up across chunks, and the 'vector' of
+        rates derived from them (see complexity_vector).
+        """
+        if doc is None:
+            doc = self._parse(text, language, self.processors_for(('complexity_vector',)))
+
+        counts = dict.fromkeys(COMPLEXITY_COUNTS, 0)
+        for sent in doc.sentences:
+            index = SentenceIndex.of(sent)
+            labels = self._sentence_labels(sent, language, index)
+            counts['sentences'] += 1
+            max_depth = 0
+            for word, feats, depth in zip(sent.words, index.feats, self._iter_word_depths(sent)):
+                max_depth = max(max_depth, depth)
+                counts['words'] += 1
+                counts['features'] += bin(feats).count('1')
+
+                if word.head != 0:
+                    counts['distance_sum'] += abs(word.id - word.head)
+                    counts['arcs'] += 1
+
+                if word.upos in ('ADP', 'CCONJ', 'SCONJ'):
+                    counts['function_words'] += 1
+                elif word.upos == 'DET' and self._classify_article(word, sent, language, index) != 'not_article':
+                    counts['function_words'] += 1
+
+                found = labels['construction'].get(word.id)
+                if found:
+                    counts[found[0][1]] += 1
+                if word.id in labels['clause']:
+                    counts['clause_constructions'] += 1
+            counts['depth_sum'] += max_depth
+
+        return {'counts': counts, 'vector': complexity_vector(counts)}
+
+    def build_token_table(self, text: str, language: str) -> TokenTable:
+        """Parse a text and return its columnar TokenTable"""
+        doc = self._parse(text, language, self.processors_for(self.ANALYSIS_PROCESSORS))
+        return TokenTable.from_document(doc)
+
+    def _function_words_from_table(self, table: TokenTable, language: str) -> Dict:
+        """Vectorized analyze_function_words over a TokenTable"""
+        metrics = {
+            'prepositions': {
+                'case_replacement': defaultdict(int),
+                'semantic': defaultdict(int),
+                'grammaticalized': defaultdict(int),
+                'other': defaultdict(int)
+            },
+            'articles': {
+                'definiteness': defaultdict(int),
+                'case_marking': defaultdict(int),
+                'other': defaultdict(int)
+            },
+            'conjunctions': {
+                'coordination': defaultdict(int),
+                'subordination': defaultdict(int)
+            },
+            'total_by_type': defaultdict(int),
+            'word_count': len(table),
+            'sentence_metrics': {
+                'tokens': np.diff(np.r_[table.sentence_starts, len(table)]).tolist(),
+                'articles': [0] * table.num_sentences
+            }
+        }
+
+        def record(category: str, subtype: str, rows: np.ndarray):
+            if rows.any():
+                metrics[category][subtype].update(table.count_forms(rows))
+                metrics['total_by_type'][category] += int(rows.sum())
+
+        # Prepositions, mirroring FUNCTION_WORD_PATTERNS
+        adp = table.is_in('upos', ['ADP'])
+        has_nmod = table.heads_with_child(table.is_in('deprel', ['nmod']))[:len(table)]
+        has_iobj = table.heads_with_child(table.is_in('deprel', ['iobj']))[:len(table)]
+        de = adp & table.is_in('form', ['de'])
+        spatial = adp & table.is_in('form', ['en', 'sobre', 'bajo'])
+        grammatical = adp & table.is_in('form', ['a', 'para', 'por'])
+        latin = adp & table.is_in('form', ['in', 'ad', 'ex', 'ab', 'cum'])
+        case_replacement = (de & has_nmod) | (grammatical & has_iobj)
+        semantic = spatial | (grammatical & ~has_iobj) | latin
+        record('prepositions', 'case_replacement', case_replacement)
+        record('prepositions', 'semantic', semantic)
+        record('prepositions', 'other', adp & ~case_replacement & ~semantic)
+
+        # Articles, mirroring the Spanish article patterns (Latin has none)
+        if language != 'la':
+            det = table.is_in('upos', ['DET'])
+            definite = det & table.is_in('form', ['el', 'la', 'los', 'las'])
+            indefinite = det & table.is_in('form', ['un', 'una', 'unos', 'unas'])
+            head_has_argument = table.heads_with_child(table.is_in('deprel', ['nsubj', 'obj']))
+            case_marking = definite & head_has_argument[table.head_slots]
+            record('articles', 'case_marking', case_marking)
+            record('articles', 'definiteness', (definite & ~case_marking) | indefinite)
+            record('articles', 'other', det & ~definite & ~indefinite)
+            metrics['sentence_metrics']['articles'] = np.bincount(
+                table.sent_id[det], minlength=table.num_sentences).tolist()
+
+        # Conjunctions
+        record('conjunctions', 'coordination', table.is_in('upos', ['CCONJ']))
+        record('conjunctions', 'subordination', table.is_in('upos', ['SCONJ']))
+
+        return metrics
+
+    def _dependency_complexity_from_table(self, table: TokenTable) -> Dict:
+        """Vectorized analyze_dependency_complexity over a TokenTable"""
+        metrics = {
+            'path_lengths': [],
+            'embedding_depth': [],
+            'dependency_types': {
+                'argument_structure': defaultdict(int),
+                'modification': defaultdict(int),
+                'coordination': defaultdict(int)
+            },
+            'dependency_distances': defaultdict(int),
+            'average_depth': 0.0,
+            'average_path_length': 0.0,
+            'max_depth': 0,
+            'sentence_metrics': {
+                'depth': [],
+                'mean_distance': []
+            }
         }
-        
-        for sent in doc.sentences:
-            # Track path lengths and distances
-            for word in sent.words:
-                if word.head != 0:  # Not root
-                    distance = abs(word.id - word.head)
-                    metrics['dependency_distances'][distance] += 1
-                    
-                    # Classify dependency types
-                    if word.deprel in ['nsubj', 'obj', 'iobj', 'ccomp']:
-                        metrics['dependency_types']['argument_structure'][word.deprel] += 1
-                    elif word.deprel in ['amod', 'advmod', 'nmod']:
-                        metrics['dependency_types']['modification'][word.deprel] += 1
-                    elif word.deprel in ['conj', 'cc']:
-                        metrics['dependency_types']['coordination'][word.deprel] += 1
-            
-            # Calculate embedding depth
-            depth = self._calculate_dependency_depth(sent)
-            metrics['embedding_depth'].append(depth)
-            metrics['max_depth'] = max(metrics['max_depth'], depth)
-        
-        if metrics['embedding_depth']:
-            metrics['average_depth'] = sum(metrics['embedding_depth']) / len(metrics['embedding_depth'])
-        
-        return metrics
+        if not len(table):
+            return metrics
 
-    def _calculate_dependency_depth(self, sentence) -> int:
-        """Calculate maximum dependency depth in a sentence"""
-        depths = defaultdict(int)
-        max_depth = 0
-        
-        for word in sentence.words:
-            current = word
-            depth = 0
-            while current.head != 0:
-                depth += 1
-                current = sentence.words[current.head - 1]
-            depths[word.id] = depth
-            max_depth = max(max_depth, depth)
-        
-        return max_depth
+        attached = table.head != 0
+        distances, counts = np.unique(np.abs(table.word_id - table.head)[attached], return_counts=True)
+        metrics['dependency_distances'].update(zip(distances.tolist(), counts.tolist()))
+        for dep_type, deprels in [('argument_structure', ['nsubj', 'obj', 'iobj', 'ccomp']),
+                                  ('modification', ['amod', 'advmod', 'nmod']),
+                                  ('coordination', ['conj', 'cc'])]:
+            rows = attached & table.is_in('deprel', deprels)
+            metrics['dependency_types'][dep_type].update(table.count_forms(rows, 'deprel'))
 
-    def track_clause_transformations(self, text: str, language: str) -> Dict:
-        """Track how Latin constructions transform in Spanish"""
-        nlp = self.latin_nlp if language == 'la' else self.spanish_nlp
-        doc = nlp(text)
-        
+        depths = table.word_depths()
+        lengths = np.diff(np.r_[table.sentence_starts, len(table)])
+        sentence_max = np.maximum.reduceat(depths, table.sentence_starts)
+        sentence_mean = np.add.reduceat(depths, table.sentence_starts) / lengths
+        metrics['embedding_depth'] = sentence_max.tolist()
+        distances = np.abs(table.word_id - table.head) * attached
+        distance_sums = np.bincount(table.sent_id, weights=distances, minlength=table.num_sentences)
+        arcs = np.bincount(table.sent_id, weights=attached, minlength=table.num_sentences)
+        metrics['sentence_metrics'] = {
+            'depth': metrics['embedding_depth'],
+            'mean_distance': np.divide(distance_sums, arcs, out=np.zeros_like(arcs), where=arcs > 0).tolist()
+        }
+        metrics['path_lengths'] = sentence_mean.tolist()
+        metrics['max_depth'] = int(sentence_max.max())
+        metrics['average_depth'] = sum(metrics['embedding_depth']) / len(metrics['embedding_depth'])
+        metrics['average_path_length'] = sum(metrics['path_lengths']) / len(metrics['path_lengths'])
+        return metrics
+
+    def _clause_transformations_from_table(self, table: TokenTable, language: str) -> Dict:
+        """Vectorized track_clause_transformations over a TokenTable"""
         transformations = {
             'ablative_absolute': {
                 'temporal_clause': 0,
@@ -296,57 +2210,227 @@ class EnhancedComplexityTracker:
                 'relative_clauses': 0
             }
         }
-        
-        for sent in doc.sentences:
-            if language == 'la':
-                self._analyze_latin_constructions(sent, transformations)
-            else:
-                self._analyze_spanish_constructions(sent, transformations)
-        
+
+        if language == 'la':
+            participle = table.has_feature(VERBFORM_PART)
+            ablative = participle & table.has_feature(CASE_ABL)
+            for construction, rows in [('ablative_absolute', ablative),
+                                       ('participial_constructions', participle & ~ablative)]:
+                if rows.any():
+                    transformations[construction]['other']['found'] += int(rows.sum())
+        else:
+            strategies = transformations['subordination_strategies']
+            remaining = np.ones(len(table), dtype=bool)
+            for strategy, rows in [('que_clauses', table.is_in('form', ['que']) & table.is_in('upos', ['SCONJ'])),
+                                   ('gerund_clauses', table.has_feature(VERBFORM_GER)),
+                                   ('infinitive_clauses', table.has_feature(VERBFORM_INF)),
+                                   ('relative_clauses', table.is_in('deprel', ['acl:relcl']))]:
+                strategies[strategy] += int((rows & remaining).sum())
+                remaining &= ~rows
+
         return transformations
 
-    def _analyze_latin_constructions(self, sentence, metrics: Dict):
-        """Analyze Latin-specific constructions"""
-        for word in sentence.words:
-            # Check for ablative absolute
-            if ('Case=Abl' in (word.feats or '') and 
-                'VerbForm=Part' in (word.feats or '')):
-                metrics['ablative_absolute']['other']['found'] += 1
-            
-            # Check for participial constructions
-            elif 'VerbForm=Part' in (word.feats or ''):
-                metrics['participial_constructions']['other']['found'] += 1
+    def _check_two_stage(self, analyses):
+        """
+        Reject analyses the two-stage prescreen cannot serve: every other
+        analysis needs a full parse of every sentence, so prescreening
+        would save nothing
+        """
+        if self.two_stage:
+            unscreened = [analysis for analysis in analyses if analysis not in self.PRESCREENED_ANALYSES]
+            if unscreened:
+                raise ValueError(f"two_stage only supports {', '.join(self.PRESCREENED_ANALYSES)}; "
+                                 f"{', '.join(unscreened)} need a full parse")
 
-    def _analyze_spanish_constructions(self, sentence, metrics: Dict):
-        """Analyze Spanish-specific constructions"""
-        for word in sentence.words:
-            # Track different types of subordination
-            if word.text.lower() == 'que' and word.upos == 'SCONJ':
-                metrics['subordination_strategies']['que_clauses'] += 1
-            elif 'VerbForm=Ger' in (word.feats or ''):
-                metrics['subordination_strategies']['gerund_clauses'] += 1
-            elif 'VerbForm=Inf' in (word.feats or ''):
-                metrics['subordination_strategies']['infinitive_clauses'] += 1
-            elif word.deprel == 'acl:relcl':
-                metrics['subordination_strategies']['relative_clauses'] += 1
-
-    def integrated_analysis(self, text: str, language: str) -> Dict:
-        """
-        Perform comprehensive analysis combining all metrics
-        """
-        results = {
-            'analytical_constructions': self.analyze_analytical_constructions(text, language),
-            'function_words': self.analyze_function_words(text, language),
-            'dependency_complexity': self.analyze_dependency_complexity(text, language),
-            'clause_transformations': self.track_clause_transformations(text, language)
+    def _prescreens(self, language: str) -> bool:
+        """Whether texts in a language are parsed in two stages"""
+        return self.two_stage and language == 'es'
+
+    def integrated_analysis(self, text: str, language: str,
+                            analyses: Tuple[str, ...] = tuple(ANALYSIS_PROCESSORS),
+                            doc: Optional[stanza.Document] = None) -> Dict:
+        """
+        Perform comprehensive analysis combining all metrics.
+
+        The text is parsed once, with the cheapest pipeline covering the
+        requested analyses, and the resulting Document is shared by every
+        analyzer; pass doc to reuse a parse made elsewhere (e.g. by
+        parse_many). A TextHandle is decoded here, when it is first needed.
+        In two_stage mode only PRESCREENED_ANALYSES may be requested, and a
+        Spanish text without a parse gets the cheap two-stage parse instead
+        (see analyze_analytical_constructions).
+        """
+        self._check_two_stage(analyses)
+        if isinstance(text, TextHandle):
+            text = text.read()
+        analyzers = {
+            'analytical_constructions': self.analyze_analytical_constructions,
+            'function_words': self.analyze_function_words,
+            'dependency_complexity': self.analyze_dependency_complexity,
+            'clause_transformations': self.track_clause_transformations,
+            'complexity_vector': self.analyze_complexity_vector
         }
+        if doc is None and self._prescreens(language):
+            results = {
+                analysis: analyzers[analysis](text, language, two_stage=True)
+                for analysis in analyses
+            }
+        else:
+            if doc is None:
+                doc = self._parse(text, language, self.processors_for(analyses))
+            results = {
+                analysis: analyzers[analysis](text, language, doc=doc)
+                for analysis in analyses
+            }
         
-        # Add normalized metrics
-        word_count = len(text.split())
-        results['normalized_metrics'] = self._calculate_normalized_metrics(results, word_count)
+        # Normalized metrics combine every analysis, so only full runs get them
+        if set(analyzers) <= set(results):
+            word_count = len(text.split())
+            results['normalized_metrics'] = self._calculate_normalized_metrics(results, word_count)
         
         return results
 
+    def integrated_analysis_streaming(self, text: str, language: str, chunk_chars: int = 20000,
+                                      analyses: Tuple[str, ...] = tuple(ANALYSIS_PROCESSORS)) -> Dict:
+        """
+        Integrated analysis of a long text in bounded chunks.
+
+        Chunks are parsed bulk_chars characters at a time through
+        parse_many, then each is analyzed on its own and its metrics are
+        folded into running totals before the next group is parsed, so only
+        one group's Documents are alive at a time. Per-sentence depth and path
+        length lists are folded into a depth histogram and a running sum;
+        only the compact sentence_metrics arrays (a few numbers per sentence)
+        grow with the text. Stanza segments sentences within a chunk, so
+        results can differ marginally from a whole-text parse at chunk
+        boundaries.
+
+        text may be a TextHandle, in which case it is decoded block by block
+        as the chunks are consumed and never held in memory as a whole. In
+        two_stage mode Spanish chunks get the two-stage parse instead.
+        """
+        self._check_two_stage(analyses)
+        if isinstance(text, TextHandle):
+            blocks = text.iter_paragraph_blocks(max(1 << 20, 10 * chunk_chars))
+        else:
+            blocks = [text]
+        totals = {}
+        depth_histogram = defaultdict(int)
+        max_depth = 0
+        path_length_sum = 0.0
+        word_count = 0
+
+        chunks = (chunk for block in blocks for chunk in split_into_chunks(block, chunk_chars))
+        processors = self.processors_for(analyses)
+        for group in _batches(chunks, max(self.bulk_chars, chunk_chars)):
+            if self._prescreens(language):
+                docs = [None] * len(group)
+            else:
+                docs = self.parse_many(group, language, processors)
+            for chunk, doc in zip(group, docs):
+                word_count += len(chunk.split())
+                part = self.integrated_analysis(chunk, language, analyses, doc=doc)
+                part.pop('normalized_metrics', None)
+
+                dependency = part.get('dependency_complexity')
+                if dependency is not None:
+                    for depth in dependency.pop('embedding_depth'):
+                        depth_histogram[depth] += 1
+                    max_depth = max(max_depth, dependency.pop('max_depth'))
+                    path_length_sum += sum(dependency.pop('path_lengths'))
+                    del dependency['average_depth'], dependency['average_path_length']
+                # Rates are recomputed from the summed counts below
+                part.get('complexity_vector', {}).pop('vector', None)
+
+                _accumulate(totals, part)
+
+        if 'dependency_complexity' in totals:
+            sentence_count = sum(depth_histogram.values())
+            depth_sum = sum(depth * n for depth, n in depth_histogram.items())
+            totals['dependency_complexity'].update({
+                'depth_histogram': depth_histogram,
+                'sentence_count': sentence_count,
+                'average_depth': depth_sum / sentence_count if sentence_count else 0.0,
+                'average_path_length': path_length_sum / sentence_count if sentence_count else 0.0,
+                'max_depth': max_depth
+            })
+
+        if 'complexity_vector' in totals:
+            totals['complexity_vector']['vector'] = complexity_vector(totals['complexity_vector']['counts'])
+
+        if set(self.ANALYSIS_PROCESSORS) <= set(totals):
+            totals['normalized_metrics'] = self._calculate_normalized_metrics(totals, word_count)
+
+        return totals
+
+    def measure_morphology(self, text: str, language: str,
+                           accumulator: Optional[MorphologyAccumulator] = None,
+                           chunk_chars: int = 20000) -> MorphologyAccumulator:
+        """
+        Feed every word of a text into a MorphologyAccumulator (a new exact
+        one by default) and return it.
+
+        The text is parsed in chunks of at most chunk_chars, bulk_chars at a
+        time, with the full analysis pipeline so parses cached by chunked
+        corpus runs are reused; each Document is dropped once counted. A
+        TextHandle is decoded block by block.
+        """
+        if accumulator is None:
+            accumulator = MorphologyAccumulator()
+        if isinstance(text, TextHandle):
+            blocks = text.iter_paragraph_blocks(max(1 << 20, 10 * chunk_chars))
+        else:
+            blocks = [text]
+
+        chunks = (chunk for block in blocks for chunk in split_into_chunks(block, chunk_chars))
+        processors = self.processors_for(self.ANALYSIS_PROCESSORS)
+        for group in _batches(chunks, max(self.bulk_chars, chunk_chars)):
+            for doc in self.parse_many(group, language, processors):
+                accumulator.add_document(doc)
+        return accumulator
+
+    def analyze_morphology(self, mode: str = 'exact', workers: int = 1, chunk_chars: int = 20000,
+                           period=None, language=None, **sketch_params) -> Dict[str, MorphologyAccumulator]:
+        """
+        Pooled morphological richness per period.
+
+        Every text in the (optionally filtered) corpus is measured with
+        measure_morphology, in worker processes with workers > 1 (see
+        _analyze_corpus_parallel), and merged into its period's
+        accumulator. Returns {period: MorphologyAccumulator}; call
+        .metrics() for the entropies and forms-per-lemma ratio. mode and
+        sketch_params are as for MorphologyAccumulator.
+        """
+        corpus = self.corpus(period, language)
+        periods = {}
+        for text in corpus:
+            periods.setdefault(text.period, MorphologyAccumulator(mode, **sketch_params))
+
+        if workers is None or workers > 1:
+            languages = {text.id: text.language for text in corpus}
+            measured = self._analyze_corpus_parallel(
+                {text.id: text.handle() for text in corpus}, workers, chunk_chars, languages,
+                task=_measure_morphology_in_worker, task_args=(mode, sketch_params))
+            for text_name, accumulator in measured.items():
+                periods[corpus[text_name].period].merge(accumulator)
+        else:
+            for text in corpus:
+                print(f"Measuring morphology of {text.id}...")
+                try:
+                    self.measure_morphology(text.handle(), text.language, periods[text.period], chunk_chars)
+                except Exception as e:
+                    print(f"Error measuring {text.id}: {e}")
+        return periods
+
+    def windowed_analysis(self, text: str, language: str, window: int = 50, step: int = 10) -> Dict:
+        """
+        Integrated analysis plus a sliding-window trajectory over sentences
+        (see window_trajectory), stored under 'windows'
+        """
+        results = self.integrated_analysis(text, language)
+        results['windows'] = window_trajectory(results, window, step)
+        return results
+
     def _calculate_normalized_metrics(self, results: Dict, word_count: int) -> Dict:
         """
         Calculate normalized versions of key metrics
@@ -366,10 +2450,17 @@ class EnhancedComplexityTracker:
         for category, counts in results['function_words']['total_by_type'].items():
             normalized['function_word_density'][category] = counts / word_count
         
+        # Clause-level constructions found (Latin keeps its counts under 'other')
+        clause_constructions = sum(
+            sum(count.values()) if isinstance(count, dict) else count
+            for strategies in results['clause_transformations'].values()
+            for count in strategies.values()
+        )
+        
         # Calculate complexity scores
         normalized['complexity_scores'] = {
-            'dependency_depth': sum(results['dependency_complexity']['embedding_depth']) / len(results['dependency_complexity']['embedding_depth']) if results['dependency_complexity']['embedding_depth'] else 0,
-            'clause_complexity': len(results['clause_transformations']['subordination_strategies']) / word_count
+            'dependency_depth': results['dependency_complexity']['average_depth'],
+            'clause_complexity': clause_constructions / word_count
         }
         
         return normalized
@@ -420,6 +2511,12 @@ class EnhancedComplexityTracker:
                 for strategy, count in clause_trans['subordination_strategies'].items():
                     report.append(f"    {strategy}: {count}")
             
+            # Complexity Vector
+            if 'complexity_vector' in analysis:
+                report.append("\nComplexity Vector:")
+                for component, value in analysis['complexity_vector']['vector'].items():
+                    report.append(f"  {component}: {value:.4f}")
+            
             # Normalized Metrics
             report.append("\nNormalized Metrics:")
             norm = analysis['normalized_metrics']
@@ -434,31 +2531,536 @@ class EnhancedComplexityTracker:
         
         return "\n".join(report)
 
-    def analyze_full_corpus(self):
+    def analyze_full_corpus(self, workers: int = 1, chunk_chars: Optional[int] = None,
+                            period=None, language=None, analyses: Optional[Tuple[str, ...]] = None):
         """
         Analyze entire corpus with enhanced metrics
+
+        With workers > 1 the texts are fanned out to a process pool (see
+        _analyze_corpus_parallel). The returned dict has the same shape and
+        ordering either way. With chunk_chars set, each text is analyzed in
+        bounded chunks (see integrated_analysis_streaming). period and
+        language restrict the run to a subset of the corpus manifest; each
+        result carries the text's manifest metadata. analyses selects the
+        integrated_analysis analyses to run: all of them by default, or
+        PRESCREENED_ANALYSES in two_stage mode.
+
+        Results are kept in a ResultStore at results_db: only texts that
+        are new, changed, or were analyzed by an older ANALYZER_VERSION or
+        with different settings are read and analyzed; the rest are loaded
+        from the store and merged back in corpus order. Each run records
+        per-text metrics for the whole corpus in the store, a filtered run
+        taking the texts outside its subset from their stored results.
         """
-        corpus = self.load_corpus()
-        results = {}
-        
+        if analyses is None:
+            analyses = self.PRESCREENED_ANALYSES if self.two_stage else self.ANALYSIS_PROCESSORS
+        analyses = tuple(analyses)
+        self._check_two_stage(analyses)
+        corpus = self.corpus(period, language)
+        store = ResultStore(self.results_db) if self.results_db is not None else None
+        settings = {'chunk_chars': chunk_chars, 'processors': self.processors,
+                    'two_stage': self.two_stage, 'analyses': list(analyses)}
+        stored = {}
+        entries = {}
+        texts = {}
+
         print("Starting enhanced corpus analysis...")
-        
-        for text_name, text_content in corpus.items():
-            print(f"Analyzing {text_name}...")
-            language = 'la' if 'latin' in text_name else 'es'
-            
-            try:
-                results[text_name] = self.integrated_analysis(text_content, language)
-            except Exception as e:
-                print(f"Error analyzing {text_name}: {e}")
-                continue
-        
+
+        for text in corpus:
+            if store is not None:
+                entries[text.id] = store.entry_for(text.path, settings, text.period, text.language)
+                if store.is_current(text.id, entries[text.id]):
+                    result = store.get(text.id)
+                    if result is not None:
+                        stored[text.id] = result
+                        continue
+            texts[text.id] = text.handle()
+
+        if stored:
+            print(f"Loaded {len(stored)} unchanged texts from {self.results_db}")
+
+        languages = {text.id: text.language for text in corpus}
+        if workers is None or workers > 1:
+            analyzed = self._analyze_corpus_parallel(texts, workers, chunk_chars, languages,
+                                                     task_args=(analyses,), analyses=analyses)
+        elif not chunk_chars:
+            analyzed = self._analyze_corpus_bulk(texts, languages, analyses)
+        else:
+            analyzed = {}
+            for text_name, text_content in texts.items():
+                print(f"Analyzing {text_name}...")
+                language = languages[text_name]
+
+                try:
+                    analyzed[text_name] = self.integrated_analysis_streaming(text_content, language, chunk_chars,
+                                                                             analyses)
+                except Exception as e:
+                    print(f"Error analyzing {text_name}: {e}")
+                    continue
+
+        results = {text.id: analyzed.get(text.id, stored.get(text.id))
+                   for text in corpus if text.id in analyzed or text.id in stored}
+        # Stored results get the current manifest metadata too (source and
+        # date can change without making a result stale)
+        relabeled = []
+        for text_name, result in results.items():
+            metadata = corpus[text_name].metadata()
+            if text_name in stored and result.get('metadata') != metadata:
+                relabeled.append(text_name)
+            result['metadata'] = metadata
+
+        if store is not None:
+            store.begin_run(settings)
+            for text_name in list(analyzed) + relabeled:
+                store.put(text_name, entries[text_name], results[text_name])
+            # A filtered run only sees part of the corpus, so it must not
+            # prune the rest, and its metrics rows are completed with the
+            # stored results of the other texts so that every run's metrics
+            # cover the whole corpus
+            corpus_results = results
+            if period is None and language is None:
+                store.prune(corpus.texts)
+            else:
+                corpus_results = {}
+                for text in self.corpus():
+                    result = results.get(text.id)
+                    if result is None:
+                        result = store.get(text.id)
+                        if result is None:
+                            continue
+                        result['metadata'] = text.metadata()
+                    corpus_results[text.id] = result
+            store.record_metrics(corpus_results)
+            store.commit()
+            store.close()
+
         return results
 
+    def _analyze_corpus_bulk(self, corpus: Dict[str, TextHandle], languages: Dict[str, str],
+                             analyses: Tuple[str, ...] = tuple(ANALYSIS_PROCESSORS)) -> Dict:
+        """
+        Analyze texts in bulk-parsed batches, one language at a time.
+
+        Texts are grouped by file size into batches of about bulk_chars and
+        parsed together with parse_many; only one batch is decoded and held
+        in memory at a time. If a batch fails to parse, its texts are
+        retried one by one so a single bad text only loses its own result.
+        Texts parsed in two stages (see integrated_analysis) skip the bulk
+        parse.
+        """
+        by_language = defaultdict(list)
+        for text_name in corpus:
+            by_language[languages[text_name]].append(text_name)
+
+        processors = self.processors_for(analyses)
+        analyzed = {}
+        for language, text_names in by_language.items():
+            for batch in _batches(text_names, self.bulk_chars, size=lambda name: corpus[name].size_bytes):
+                texts = [corpus[text_name].read() for text_name in batch]
+                print(f"Analyzing {', '.join(batch)}...")
+                docs = [None] * len(batch)
+                if not self._prescreens(language):
+                    try:
+                        docs = self.parse_many(texts, language, processors)
+                    except Exception as e:
+                        print(f"Bulk parse failed ({e}); parsing texts one at a time")
+
+                for text_name, text, doc in zip(batch, texts, docs):
+                    try:
+                        analyzed[text_name] = self.integrated_analysis(text, language, analyses, doc=doc)
+                    except Exception as e:
+                        print(f"Error analyzing {text_name}: {e}")
+        return {text_name: analyzed[text_name] for text_name in corpus if text_name in analyzed}
+
+    def _analyze_corpus_parallel(self, corpus: Dict[str, TextHandle], workers: Optional[int],
+                                 chunk_chars: Optional[int], languages: Dict[str, str],
+                                 task=None, task_args: Tuple = (),
+                                 analyses: Tuple[str, ...] = tuple(ANALYSIS_PROCESSORS)) -> Dict:
+        """
+        Analyze texts in worker processes, one pool per language.
+
+        Each text is run through task(text, language, chunk_chars,
+        *task_args) in a worker, by default _analyze_in_worker.
+
+        Each worker loads only its language's Stanza pipeline for analyses,
+        once, in the pool initializer, so memory grows with the worker count. Workers are
+        split between the languages in proportion to their number of texts,
+        and results are returned in corpus order regardless of completion
+        order. TextHandles pickle as paths, so each worker reads its own
+        texts instead of receiving them through the pool.
+        """
+        workers = workers or os.cpu_count() or 1
+        task = task or _analyze_in_worker
+        by_language = defaultdict(list)
+        for text_name in corpus:
+            by_language[languages[text_name]].append(text_name)
+
+        executors = []
+        futures = {}
+        try:
+            for language, text_names in by_language.items():
+                share = max(1, round(workers * len(text_names) / len(corpus)))
+                executor = ProcessPoolExecutor(
+                    max_workers=min(share, len(text_names)),
+                    initializer=_init_worker,
+                    initargs=(language, self.cache_dir, self.cache_max_bytes, self.processors,
+                              self.batch_sizes, self.two_stage, tuple(analyses))
+                )
+                executors.append(executor)
+                for text_name in text_names:
+                    future = executor.submit(task, corpus[text_name], language, chunk_chars, *task_args)
+                    futures[future] = text_name
+
+            completed = {}
+            for future in as_completed(futures):
+                text_name = futures[future]
+                try:
+                    completed[text_name] = future.result()
+                    print(f"Analyzed {text_name}")
+                except Exception as e:
+                    print(f"Error analyzing {text_name}: {e}")
+        finally:
+            for executor in executors:
+                executor.shutdown()
+
+        return {text_name: completed[text_name] for text_name in corpus if text_name in completed}
+
+# Tracker owned by each analyze_full_corpus worker process
+_worker_tracker = None
+
+def _init_worker(language: str, cache_dir: Optional[Path], cache_max_bytes: int,
+                 processors: Optional[str], batch_sizes: Dict[str, int], two_stage: bool = False,
+                 analyses: Tuple[str, ...] = tuple(EnhancedComplexityTracker.ANALYSIS_PROCESSORS)):
+    """Process pool initializer: load one language's pipeline for analyses per worker"""
+    global _worker_tracker
+    _worker_tracker = EnhancedComplexityTracker(cache_dir=cache_dir,
+                                                cache_max_bytes=cache_max_bytes,
+                                                processors=processors,
+                                                batch_sizes=batch_sizes,
+                                                two_stage=two_stage)
+    if not _worker_tracker._prescreens(language):
+        _worker_tracker.get_pipeline(language, _worker_tracker.processors_for(analyses))
+
+def _analyze_in_worker(text: TextHandle, language: str, chunk_chars: Optional[int],
+                       analyses: Tuple[str, ...] = tuple(EnhancedComplexityTracker.ANALYSIS_PROCESSORS)) -> Dict:
+    if chunk_chars:
+        return _worker_tracker.integrated_analysis_streaming(text, language, chunk_chars, analyses)
+    return _worker_tracker.integrated_analysis(text, language, analyses)
+
+def _measure_morphology_in_worker(text: TextHandle, language: str, chunk_chars: int,
+                                  mode: str, sketch_params: Dict) -> MorphologyAccumulator:
+    return _worker_tracker.measure_morphology(text, language, MorphologyAccumulator(mode, **sketch_params),
+                                              chunk_chars)
+
+class RollingWindow:
+    """
+    Sliding window over per-sentence metrics with O(1) updates.
+
+    Running sums of depth, tokens, articles and synthetic/analytic
+    construction counts are adjusted as sentences enter and leave, and the
+    window's maximum depth comes from a monotonic deque, so advancing the
+    window by one sentence costs amortized O(1) however large it is.
+    """
+    FIELDS = ('depth', 'tokens', 'articles', 'synthetic', 'analytic')
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError(f"Window size must be positive, got {size}")
+        self.size = size
+        self.sentences = deque()
+        self.sums = dict.fromkeys(self.FIELDS, 0)
+        # (position, depth) pairs with strictly decreasing depth
+        self._max_depths = deque()
+        self._position = 0
+
+    def add(self, depth: int, tokens: int, articles: int, synthetic: int, analytic: int):
+        """Append a sentence, evicting the oldest once the window is full"""
+        record = (depth, tokens, articles, synthetic, analytic)
+        self.sentences.append(record)
+        for field, value in zip(self.FIELDS, record):
+            self.sums[field] += value
+        while self._max_depths and self._max_depths[-1][1] <= depth:
+            self._max_depths.pop()
+        self._max_depths.append((self._position, depth))
+        self._position += 1
+
+        if len(self.sentences) > self.size:
+            for field, value in zip(self.FIELDS, self.sentences.popleft()):
+                self.sums[field] -= value
+            if self._max_depths[0][0] <= self._position - 1 - self.size:
+                self._max_depths.popleft()
+
+    def metrics(self) -> Dict[str, float]:
+        """Metrics of the sentences currently in the window"""
+        n = len(self.sentences)
+        tokens = self.sums['tokens']
+        return {
+            'sentences': n,
+            'average_depth': self.sums['depth'] / n if n else 0.0,
+            'max_depth': self._max_depths[0][1] if self._max_depths else 0,
+            'article_rate': self.sums['articles'] / tokens * 1000 if tokens else 0.0,
+            'synthetic': self.sums['synthetic'],
+            'analytic': self.sums['analytic']
+        }
+
+def window_trajectory(result: Dict, window: int = 50, step: int = 10) -> Dict[str, List]:
+    """
+    Metrics of every window of `window` consecutive sentences, advancing
+    `step` sentences at a time, from the per-sentence arrays of an
+    integrated_analysis result (fresh or loaded from the results store).
+
+    Returns {'start': [...], 'average_depth': [...], ...} with one entry per
+    window; a text shorter than the window yields a single window.
+    """
+    columns = (
+        result['dependency_complexity']['sentence_metrics']['depth'],
+        result['function_words']['sentence_metrics']['tokens'],
+        result['function_words']['sentence_metrics']['articles'],
+        result['analytical_constructions']['sentence_metrics']['synthetic_constructions'],
+        result['analytical_constructions']['sentence_metrics']['analytic_constructions']
+    )
+    if len({len(column) for column in columns}) != 1:
+        raise ValueError("Per-sentence metric arrays have different lengths")
+
+    trajectory = defaultdict(list)
+    rolling = RollingWindow(window)
+    n = len(columns[0])
+    for i, record in enumerate(zip(*columns)):
+        rolling.add(*record)
+        start = i + 1 - window
+        if (start >= 0 and start % step == 0) or (i == n - 1 and n < window):
+            trajectory['start'].append(max(start, 0))
+            for name, value in rolling.metrics().items():
+                trajectory[name].append(value)
+    return dict(trajectory)
+
+class BootstrapEngine:
+    """
+    Vectorized, seeded bootstrap confidence intervals for the mean.
+
+    Resample indices are drawn from a numpy Generator as an (n_bootstrap x n)
+    matrix, in row chunks of at most chunk_elements entries, so 100k+
+    resamples stay fast with bounded memory. Each call starts from the same
+    seed, so intervals are reproducible between runs. Supports percentile
+    and BCa (bias-corrected and accelerated) intervals.
+    """
+    def __init__(self, n_bootstrap: int = 100000, seed: int = 0, confidence: float = 0.95,
+                 method: str = 'percentile', chunk_elements: int = 4000000):
+        if method not in ('percentile', 'bca'):
+            raise ValueError(f"Unknown bootstrap CI method: {method}")
+        self.n_bootstrap = n_bootstrap
+        self.seed = seed
+        self.confidence = confidence
+        self.method = method
+        self.chunk_elements = chunk_elements
+
+    def bootstrap_means(self, data: np.ndarray, n_bootstrap: Optional[int] = None) -> np.ndarray:
+        """
+        Bootstrap means of each row of data, shape (groups, n_bootstrap).
+
+        All rows share the same resample indices, so equal-sized groups are
+        resampled together in one pass.
+        """
+        data = np.atleast_2d(np.asarray(data, dtype=float))
+        n_bootstrap = n_bootstrap or self.n_bootstrap
+        n = data.shape[1]
+        rng = np.random.default_rng(self.seed)
+        means = np.empty((data.shape[0], n_bootstrap))
+        rows_per_chunk = max(1, self.chunk_elements // n)
+        for start in range(0, n_bootstrap, rows_per_chunk):
+            stop = min(start + rows_per_chunk, n_bootstrap)
+            indices = rng.integers(0, n, size=(stop - start, n))
+            means[:, start:stop] = data[:, indices].mean(axis=-1)
+        return means
+
+    def _interval(self, data: np.ndarray, boot: np.ndarray, method: str) -> np.ndarray:
+        alpha = 1 - self.confidence
+        if method == 'percentile' or np.ptp(boot) == 0:
+            return np.percentile(boot, [100 * alpha / 2, 100 * (1 - alpha / 2)])
+
+        # BCa: bias correction from the bootstrap distribution, acceleration
+        # from the jackknife means
+        theta = data.mean()
+        z0 = stats.norm.ppf(np.clip(np.mean(boot < theta), 1e-12, 1 - 1e-12))
+        jackknife = (data.sum() - data) / (len(data) - 1)
+        deviations = jackknife.mean() - jackknife
+        denominator = 6 * np.sum(deviations ** 2) ** 1.5
+        acceleration = np.sum(deviations ** 3) / denominator if denominator > 0 else 0.0
+        z = stats.norm.ppf([alpha / 2, 1 - alpha / 2])
+        adjusted = stats.norm.cdf(z0 + (z0 + z) / (1 - acceleration * (z0 + z)))
+        return np.percentile(boot, 100 * adjusted)
+
+    def hierarchical_ratios(self, numerators: List[np.ndarray], denominators: List[np.ndarray],
+                            n_bootstrap: Optional[int] = None) -> np.ndarray:
+        """
+        Two-stage (text -> sentence) bootstrap of a ratio of sums.
+
+        Each replicate resamples the texts with replacement, then resamples
+        the sentences of every picked text with replacement, and returns
+        sum(numerator) / sum(denominator) over all picked sentences. Texts are
+        processed one at a time: the replicates that picked a text draw its
+        sentence resamples in chunks and scatter the sums back with
+        np.bincount, so memory stays bounded by chunk_elements. The cost
+        grows with n_bootstrap times the number of sentences.
+        """
+        n_bootstrap = n_bootstrap or self.n_bootstrap
+        k = len(numerators)
+        rng = np.random.default_rng(self.seed)
+        picks = rng.multinomial(k, np.full(k, 1 / k), size=n_bootstrap)
+        num_totals = np.zeros(n_bootstrap)
+        den_totals = np.zeros(n_bootstrap)
+        for text, (num, den) in enumerate(zip(numerators, denominators)):
+            num = np.asarray(num, dtype=float)
+            den = np.asarray(den, dtype=float)
+            n = len(num)
+            if n == 0:
+                continue
+            replicates = np.repeat(np.arange(n_bootstrap), picks[:, text])
+            rows_per_chunk = max(1, self.chunk_elements // n)
+            for start in range(0, len(replicates), rows_per_chunk):
+                rows = replicates[start:start + rows_per_chunk]
+                indices = rng.integers(0, n, size=(len(rows), n))
+                num_totals += np.bincount(rows, num[indices].sum(axis=1), minlength=n_bootstrap)
+                den_totals += np.bincount(rows, den[indices].sum(axis=1), minlength=n_bootstrap)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return num_totals / den_totals
+
+    def ci(self, data, n_bootstrap: Optional[int] = None, method: Optional[str] = None) -> np.ndarray:
+        """Confidence interval for the mean of one sample"""
+        return self.batch_ci({None: data}, n_bootstrap, method)[None]
+
+    def batch_ci(self, groups: Dict, n_bootstrap: Optional[int] = None,
+                 method: Optional[str] = None) -> Dict:
+        """
+        Confidence intervals for many samples in one batched call.
+
+        Groups of equal size are stacked and share one resample matrix.
+        Empty groups get [nan, nan].
+        """
+        method = method or self.method
+        by_size = defaultdict(list)
+        for key, values in groups.items():
+            by_size[len(values)].append(key)
+
+        intervals = {}
+        for size, keys in by_size.items():
+            if size == 0:
+                for key in keys:
+                    intervals[key] = np.array([np.nan, np.nan])
+                continue
+            data = np.array([np.asarray(groups[key], dtype=float) for key in keys])
+            boot = self.bootstrap_means(data, n_bootstrap)
+            for row, key in enumerate(keys):
+                intervals[key] = self._interval(data[row], boot[row], method)
+        return {key: intervals[key] for key in groups}
+
+class PermutationTest:
+    """
+    Batched two-sample permutation tests on the difference in means.
+
+    When the number of distinct group assignments C(n1 + n2, n1) is at most
+    max_exact they are all enumerated and the p-value is exact; otherwise
+    n_resamples random assignments are drawn from a seeded Generator and the
+    p-value is the Monte Carlo estimate (count + 1) / (n_resamples + 1).
+    Tests with the same group sizes are stacked and share one assignment
+    matrix, and the size groups run in parallel threads.
+    """
+    def __init__(self, n_resamples: int = 100000, max_exact: int = 200000, seed: int = 0,
+                 chunk_elements: int = 4000000, workers: Optional[int] = None):
+        self.n_resamples = n_resamples
+        self.max_exact = max_exact
+        self.seed = seed
+        self.chunk_elements = chunk_elements
+        self.workers = workers
+
+    def _assignments(self, n: int, n1: int) -> Tuple[str, int, Iterator[np.ndarray]]:
+        """Chunks of group-1 index rows, plus the method and total count"""
+        total = math.comb(n, n1)
+        rows_per_chunk = max(1, self.chunk_elements // max(n1, 1))
+        if total <= self.max_exact:
+            combinations = itertools.combinations(range(n), n1)
+            def exact():
+                while True:
+                    chunk = list(itertools.islice(combinations, rows_per_chunk))
+                    if not chunk:
+                        return
+                    yield np.array(chunk, dtype=np.intp).reshape(len(chunk), n1)
+            return 'exact', total, exact()
+
+        rng = np.random.default_rng(self.seed)
+        def monte_carlo():
+            for start in range(0, self.n_resamples, rows_per_chunk):
+                rows = min(rows_per_chunk, self.n_resamples - start)
+                yield rng.permuted(np.tile(np.arange(n), (rows, 1)), axis=1)[:, :n1]
+        return 'monte_carlo', self.n_resamples, monte_carlo()
+
+    def _run_group(self, tests: Dict) -> Dict:
+        """Run tests whose samples all share the same (n1, n2)"""
+        keys = list(tests)
+        x = np.array([np.asarray(tests[key][0], dtype=float) for key in keys])
+        y = np.array([np.asarray(tests[key][1], dtype=float) for key in keys])
+        n1, n2 = x.shape[1], y.shape[1]
+        pooled = np.concatenate([x, y], axis=1)
+        totals = pooled.sum(axis=1, keepdims=True)
+        observed = x.mean(axis=1) - y.mean(axis=1)
+        # Tolerance so permutations tied with the observed statistic count
+        threshold = np.abs(observed) - 1e-9 * np.maximum(1, np.abs(observed))
+
+        method, n_permutations, assignments = self._assignments(n1 + n2, n1)
+        extreme = np.zeros(len(keys))
+        for group1 in assignments:
+            sums = pooled[:, group1].sum(axis=-1)
+            diffs = sums / n1 - (totals - sums) / n2
+            extreme += (np.abs(diffs) >= threshold[:, None]).sum(axis=1)
+
+        if method == 'exact':
+            p_values = extreme / n_permutations
+        else:
+            p_values = (extreme + 1) / (n_permutations + 1)
+        return {
+            key: {
+                'statistic': float(observed[row]),
+                'p_value': float(p_values[row]),
+                'method': method,
+                'n_permutations': n_permutations
+            }
+            for row, key in enumerate(keys)
+        }
+
+    def test(self, x, y) -> Dict:
+        """Permutation test for a single pair of samples"""
+        return self.batch_test({None: (x, y)})[None]
+
+    def batch_test(self, tests: Dict) -> Dict:
+        """
+        Run many tests at once; tests maps a key to an (x, y) pair of samples.
+
+        Pairs with an empty sample get a nan p-value.
+        """
+        by_shape = defaultdict(dict)
+        results = {}
+        for key, (x, y) in tests.items():
+            if len(x) == 0 or len(y) == 0:
+                results[key] = {'statistic': np.nan, 'p_value': np.nan,
+                                'method': None, 'n_permutations': 0}
+            else:
+                by_shape[(len(x), len(y))][key] = (x, y)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for group_results in executor.map(self._run_group, by_shape.values()):
+                results.update(group_results)
+        return {key: results[key] for key in tests}
+
 class StatisticalAnalysis:
-    def __init__(self, results):
+    def __init__(self, results, n_bootstrap: int = 100000, seed: int = 0,
+                 ci_method: str = 'percentile', n_hierarchical: int = 10000):
         self.results = results
         self.period_data = self._organize_by_period()
+        # Hierarchical replicates resample every sentence, so they get their
+        # own, smaller count (see hierarchical_bootstrap)
+        self.n_hierarchical = n_hierarchical
+        self.bootstrap = BootstrapEngine(n_bootstrap=n_bootstrap, seed=seed, method=ci_method)
+        self.permutation = PermutationTest(n_resamples=n_bootstrap, seed=seed)
 
     def _organize_by_period(self):
         period_data = {
@@ -468,12 +3070,9 @@ class StatisticalAnalysis:
         }
         
         for text_name, data in self.results.items():
-            if text_name.startswith('latin_'):
-                period_data['Classical'].append(data)
-            elif text_name.startswith('medieval_'):
-                period_data['Medieval'].append(data)
-            elif text_name.startswith('spanish_'):
-                period_data['Spanish'].append(data)
+            period = period_for(text_name, data)
+            if period in period_data:
+                period_data[period].append(data)
         return period_data
 
     def analyze_dependency_evolution(self):
@@ -495,6 +3094,9 @@ class StatisticalAnalysis:
         for p1, p2 in [('Classical', 'Medieval'), ('Medieval', 'Spanish'), ('Classical', 'Spanish')]:
             stat, p_val = stats.mannwhitneyu(depths[p1], depths[p2], alternative='two-sided')
             mw_tests[f'{p1}_vs_{p2}'] = {'statistic': stat, 'p_value': p_val}
+
+        # Permutation tests on the difference in means
+        permutation_tests = self.permutation_tests(['dependency_depth'])['dependency_depth']
         
         # Effect sizes
         effect_sizes = {
@@ -519,7 +3121,8 @@ class StatisticalAnalysis:
             'parametric': {'f_stat': f_stat, 'p_value': anova_p},
             'non_parametric': {
                 'kruskal_wallis': {'h_stat': h_stat, 'p_value': kw_p},
-                'mann_whitney': mw_tests
+                'mann_whitney': mw_tests,
+                'permutation': permutation_tests
             },
             'effect_sizes': effect_sizes,
             'period_stats': period_stats,
@@ -602,6 +3205,9 @@ class StatisticalAnalysis:
                         mw_tests[f'{p1}_vs_{p2}'] = {'statistic': stat, 'p_value': p_val}
                         effect_sizes[f'{p1}_vs_{p2}'] = self.cohens_d(valid_periods[p1], 
                                                                     valid_periods[p2])
+
+                # Permutation tests on the difference in means
+                permutation_tests = self.permutation_tests(['article_rate'])['article_rate']
                 
                 # Calculate period statistics
                 period_stats = {
@@ -619,7 +3225,8 @@ class StatisticalAnalysis:
                     'parametric': {'f_stat': f_stat, 'p_value': anova_p},
                     'non_parametric': {
                         'kruskal_wallis': {'h_stat': h_stat, 'p_value': kw_p},
-                        'mann_whitney': mw_tests
+                        'mann_whitney': mw_tests,
+                        'permutation': permutation_tests
                     },
                     'effect_sizes': effect_sizes,
                     'period_stats': period_stats,
@@ -786,13 +3393,108 @@ class StatisticalAnalysis:
         pooled_se = np.sqrt(((n1 - 1) * var1 + (n2 - 1) * var2) / (n1 + n2 - 2))
         return (np.mean(group1) - np.mean(group2)) / pooled_se
 
-    def bootstrap_ci(self, data, n_bootstrap=1000):
+    def bootstrap_ci(self, data, n_bootstrap=None):
         """Calculate 95% confidence intervals"""
-        bootstrap_samples = []
-        for _ in range(n_bootstrap):
-            sample = np.random.choice(data, size=len(data), replace=True)
-            bootstrap_samples.append(np.mean(sample))
-        return np.percentile(bootstrap_samples, [2.5, 97.5])
+        return self.bootstrap.ci(data, n_bootstrap)
+
+    def _text_metrics(self) -> Dict[str, Dict[str, List[float]]]:
+        """Per-text dependency, article and construction metrics by period"""
+        metrics = {}
+        for period, texts in self.period_data.items():
+            values = defaultdict(list)
+            for text in texts:
+                for metric, value in text_metrics(text).items():
+                    values[metric].append(value)
+            metrics[period] = dict(values)
+        return metrics
+
+    def permutation_tests(self, metrics: Optional[List[str]] = None) -> Dict[str, Dict[str, Dict]]:
+        """
+        Permutation tests for every period pair of the given metrics.
+
+        All metrics and pairs are submitted as one batch. Returns
+        {metric: {'P1_vs_P2': result}}, keyed like the Mann-Whitney tests;
+        pairs where either period has no data are skipped.
+        """
+        text_metrics = self._text_metrics()
+        metrics = metrics or sorted({m for values in text_metrics.values() for m in values})
+        tests = {}
+        for metric in metrics:
+            for p1, p2 in [('Classical', 'Medieval'), ('Medieval', 'Spanish'), ('Classical', 'Spanish')]:
+                x = text_metrics.get(p1, {}).get(metric, [])
+                y = text_metrics.get(p2, {}).get(metric, [])
+                if x and y:
+                    tests[(metric, f'{p1}_vs_{p2}')] = (x, y)
+
+        results = {metric: {} for metric in metrics}
+        for (metric, pair), result in self.permutation.batch_test(tests).items():
+            results[metric][pair] = result
+        return results
+
+    def hierarchical_bootstrap(self, metric: str,
+                               n_bootstrap: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Text -> sentence bootstrap CIs from the stored per-sentence arrays.
+
+        metric is 'depth' (mean dependency depth per sentence),
+        'mean_distance' (mean dependency distance per sentence) or
+        'article_rate' (articles per 1000 tokens). Needs no re-parsing, so
+        it runs on cached results. Returns {period: {'estimate', 'ci',
+        'texts', 'sentences'}}; periods without sentence data are skipped.
+        Each replicate resamples every sentence, so n_bootstrap defaults to
+        n_hierarchical rather than the engine's n_bootstrap.
+        """
+        n_bootstrap = n_bootstrap or self.n_hierarchical
+        results = {}
+        for period, texts in self.period_data.items():
+            numerators, denominators = [], []
+            for text in texts:
+                if metric == 'article_rate':
+                    arrays = text['function_words'].get('sentence_metrics', {})
+                    num = np.asarray(arrays.get('articles', []), dtype=float) * 1000
+                    den = np.asarray(arrays.get('tokens', []), dtype=float)
+                else:
+                    arrays = text['dependency_complexity'].get('sentence_metrics', {})
+                    num = np.asarray(arrays.get(metric, []), dtype=float)
+                    den = np.ones_like(num)
+                if len(num):
+                    numerators.append(num)
+                    denominators.append(den)
+            if not numerators:
+                continue
+
+            estimate = sum(n.sum() for n in numerators) / sum(d.sum() for d in denominators)
+            boot = self.bootstrap.hierarchical_ratios(numerators, denominators, n_bootstrap)
+            boot = boot[np.isfinite(boot)]
+            alpha = 1 - self.bootstrap.confidence
+            results[period] = {
+                'estimate': estimate,
+                'ci': np.percentile(boot, [100 * alpha / 2, 100 * (1 - alpha / 2)]),
+                'texts': len(numerators),
+                'sentences': sum(len(n) for n in numerators)
+            }
+        return results
+
+    def bootstrap_all_periods(self, n_bootstrap: Optional[int] = None,
+                              method: Optional[str] = None) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Bootstrap CIs for every metric and period in one batched call.
+
+        Returns {metric: {period: [lower, upper]}} for dependency depth,
+        article rate and synthetic/analytic construction rates (per 1000
+        words).
+        """
+        groups = {
+            (metric, period): values
+            for period, period_metrics in self._text_metrics().items()
+            for metric, values in period_metrics.items()
+        }
+        intervals = self.bootstrap.batch_ci(groups, n_bootstrap, method)
+
+        cis = defaultdict(dict)
+        for (metric, period), interval in intervals.items():
+            cis[metric][period] = interval
+        return dict(cis)
 
     def format_results(self, result):
         """Format a single analysis result with robust error handling"""
@@ -889,16 +3591,58 @@ class StatisticalAnalysis:
             'raw_results': {
                 'dependency_evolution': dependency_results,
                 'analytical_shift': analytical_results,
-                'article_development': article_results
+                'article_development': article_results,
+                'bootstrap_cis': self.bootstrap_all_periods(),
+                'permutation_tests': self.permutation_tests(),
+                'hierarchical_cis': {
+                    metric: self.hierarchical_bootstrap(metric)
+                    for metric in ('depth', 'mean_distance', 'article_rate')
+                }
             },
             'formatted_output': formatted_output
         }
     
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the enhanced complexity analysis over the corpus")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="number of worker processes (0 = one per CPU)")
+    parser.add_argument('--chunk-chars', type=int, default=None,
+                        help="analyze texts in chunks of at most this many characters")
+    parser.add_argument('--period', action='append',
+                        help="only analyze texts of this period (repeatable)")
+    parser.add_argument('--language', action='append',
+                        help="only analyze texts in this language code (repeatable)")
+    parser.add_argument('--corpus-dir', type=Path, default=CORPUS_DIR,
+                        help="corpus directory holding manifest.json and the texts")
+    parser.add_argument('--morphology', choices=sorted(MorphologyAccumulator.MODES),
+                        help="also measure form entropy and forms per lemma by period, "
+                             "exactly or with bounded-memory sketches")
+    parser.add_argument('--two-stage', action='store_true',
+                        help="only count analytical constructions, POS tagging just the Spanish "
+                             "sentences that can hold one (skips the statistics and report)")
+    args = parser.parse_args()
+
     # Initialize and run corpus analysis
-    tracker = EnhancedComplexityTracker()
+    tracker = EnhancedComplexityTracker(corpus_dir=args.corpus_dir, two_stage=args.two_stage)
     print("Starting enhanced analysis of complete corpus...")
-    results = tracker.analyze_full_corpus()
+    results = tracker.analyze_full_corpus(workers=args.workers or None, chunk_chars=args.chunk_chars,
+                                          period=args.period, language=args.language)
+
+    if args.two_stage:
+        print("\nAnalytical Constructions (synthetic / analytic):")
+        for text_name, text_data in results.items():
+            constructions = text_data['analytical_constructions']
+            counts = ', '.join(f"{construction} {forms['synthetic']}/{forms['analytic']}"
+                               for construction, forms in constructions.items()
+                               if 'synthetic' in forms)
+            print(f"  {text_name}: {counts}")
+            if 'prescreen' in constructions:
+                prescreen = constructions['prescreen']
+                print(f"    tagged {prescreen['tagged_sentences']:,} of {prescreen['sentences']:,} "
+                      f"sentences ({prescreen['tokens']:,} tokens)")
+        parser.exit()
 
         # Debug print - check what's in results
     for text_name, text_data in results.items():
@@ -911,6 +3655,21 @@ if __name__ == "__main__":
     # Run statistical analyses
     stats_analyzer = StatisticalAnalysis(results)
     analysis_results = stats_analyzer.run_all_analyses()
+    statistics = dict(analysis_results['raw_results'])
+    if args.morphology:
+        morphology = tracker.analyze_morphology(mode=args.morphology, workers=args.workers or None,
+                                                chunk_chars=args.chunk_chars or 20000,
+                                                period=args.period, language=args.language)
+        statistics['morphology'] = {period: accumulator.metrics()
+                                    for period, accumulator in morphology.items()}
+    if tracker.results_db is not None and not (args.period or args.language):
+        store = ResultStore(tracker.results_db)
+        store.put_statistics(statistics)
+        store.close()
+    elif tracker.results_db is not None:
+        # 03_create_figures.py renders the latest stored statistics, which
+        # must describe the whole corpus
+        print("Filtered run: statistics are not stored")
     
     # Print descriptive results
     print(tracker.generate_enhanced_report(results))
@@ -923,6 +3682,8 @@ if __name__ == "__main__":
     raw_results = analysis_results['raw_results']
     
     for analysis_name, result in raw_results.items():
+        if analysis_name in ('bootstrap_cis', 'permutation_tests', 'hierarchical_cis'):
+            continue
         print(f"\n{analysis_name}:")
         
         # Print parametric test results
@@ -944,6 +3705,12 @@ if __name__ == "__main__":
                 print(f"      {pair}:")
                 print(f"        Statistic: {stats['statistic']:.4f}")
                 print(f"        p-value: {stats['p_value']:.4f}")
+
+            print("\n    Permutation Tests (difference in means):")
+            for pair, stats in result['non_parametric'].get('permutation', {}).items():
+                print(f"      {pair}:")
+                print(f"        Mean difference: {stats['statistic']:.4f}")
+                print(f"        p-value: {stats['p_value']:.4f} ({stats['method']}, {stats['n_permutations']:,} permutations)")
         
         # Print effect sizes
         if 'effect_sizes' in result:
@@ -963,4 +3730,29 @@ if __name__ == "__main__":
                         print(f"      95% CI: [{value[0]:.4f}, {value[1]:.4f}]")
         
         # Print line for readability
-        print("\n" + "=" * 50)
\ No newline at end of file
+        print("\n" + "=" * 50)
+
+    # Print batched bootstrap confidence intervals
+    print("\nBootstrap 95% CIs by Period:")
+    for metric, period_cis in raw_results['bootstrap_cis'].items():
+        print(f"\n  {metric}:")
+        for period, ci in period_cis.items():
+            print(f"    {period}: [{ci[0]:.4f}, {ci[1]:.4f}]")
+
+    print("\nComplexity Budget by Period (mean z-score of the budget components):")
+    budget = complexity_budget(results)
+    if len(budget):
+        columns = list(BUDGET_COMPONENTS) + ['analytic_share', 'budget']
+        print(budget.groupby('period')[columns].mean().round(4).to_string())
+
+    if 'morphology' in statistics:
+        print(f"\nMorphological Richness by Period ({args.morphology}):")
+        print(pd.DataFrame(statistics['morphology']).T.round(4).to_string())
+
+    print("\nHierarchical (text -> sentence) Bootstrap 95% CIs by Period:")
+    for metric, period_cis in raw_results['hierarchical_cis'].items():
+        print(f"\n  {metric}:")
+        for period, result in period_cis.items():
+            ci = result['ci']
+            print(f"    {period}: {result['estimate']:.4f} [{ci[0]:.4f}, {ci[1]:.4f}]"
+                  f" ({result['texts']} texts, {result['sentences']:,} sentences)")
@@ -5,208 +5,325 @@ Create figures for Latin-Spanish complexity conservation paper.
 This script generates the two main figures:
 1. Article development across historical periods
 2. Analytical vs synthetic construction shift
+
+plus the statistical summary table. All numbers are read from the results
+store written by 02_nlp_analysis.py, and outputs whose inputs have not
+changed since the last render are skipped.
 """
 
+import argparse
+import hashlib
+import importlib.util
+import json
+import sqlite3
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
+import pandas as pd
 import seaborn as sns
 
 # Set style for academic publication
 plt.style.use('seaborn-v0_8-whitegrid')
 sns.set_palette("husl")
 
-def create_article_development_figure():
+# Load the analysis module for the shared results store path (digit-prefixed filename)
+spec = importlib.util.spec_from_file_location(
+    "nlp_analysis", Path(__file__).resolve().parent / "02_nlp_analysis.py")
+nlp_analysis = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(nlp_analysis)
+
+BASE_DIR = nlp_analysis.PROJECT_DIR
+RESULTS_DB = nlp_analysis.RESULTS_DB
+FIGURES_DIR = BASE_DIR / "results" / "figures"
+TABLES_DIR = BASE_DIR / "results" / "tables"
+# Input hash of each rendered output, used to skip unchanged renders
+RENDER_MANIFEST = BASE_DIR / "results" / "render_manifest.json"
+
+PERIOD_LABELS = {
+    'Classical': 'Classical Latin',
+    'Medieval': 'Medieval Latin',
+    'Spanish': 'Early Spanish'
+}
+
+def load_statistics(db_path: Path = RESULTS_DB, run_id=None) -> dict:
+    """StatisticalAnalysis raw results of one run, the latest by default"""
+    with sqlite3.connect(db_path) as conn:
+        if run_id is None:
+            run_id = conn.execute("SELECT MAX(run_id) FROM statistics").fetchone()[0]
+        rows = conn.execute("SELECT analysis, payload FROM statistics WHERE run_id = ?",
+                            (run_id,)).fetchall()
+    if not rows:
+        raise SystemExit(f"No statistics in {db_path}; run 02_nlp_analysis.py first")
+    return {analysis: json.loads(payload) for analysis, payload in rows}
+
+def significance(p_value: float) -> str:
+    if p_value < 0.001:
+        return '***'
+    if p_value < 0.01:
+        return '**'
+    if p_value < 0.05:
+        return '*'
+    return 'ns'
+
+def create_article_development_figure(article_results: dict, output_dir: Path = FIGURES_DIR):
     """Create Figure 1: Article Development Across Periods"""
-    
-    # Data from corrected analysis
-    periods = ['Classical\nLatin', 'Medieval\nLatin', 'Early\nSpanish']
-    means = [0.000, 0.000, 107.018]
-    errors = [0.000, 0.000, 22.970]
-    
+
+    # Data from the stored article development analysis
+    period_stats = article_results['period_stats']
+    period_keys = [p for p in PERIOD_LABELS if p in period_stats]
+    periods = [PERIOD_LABELS[p].replace(' ', '\n') for p in period_keys]
+    means = [period_stats[p]['mean'] for p in period_keys]
+    errors = [period_stats[p]['std'] for p in period_keys]
+    kruskal_p = article_results['non_parametric']['kruskal_wallis']['p_value']
+
     # Create figure
     fig, ax = plt.subplots(figsize=(10, 8))
-    
+
     # Create bars with different colors for each period
     colors = ['#8B4513', '#A0522D', '#CD853F']  # Brown tones
-    bars = ax.bar(periods, means, yerr=errors, capsize=10, 
-                  color=colors, alpha=0.8, edgecolor='black', linewidth=1.5)
-    
+    bars = ax.bar(periods, means, yerr=errors, capsize=10,
+                  color=colors[:len(periods)], alpha=0.8, edgecolor='black', linewidth=1.5)
+
     # Customize the plot
     ax.set_ylabel('Articles per 1000 words', fontsize=14, fontweight='bold')
-    ax.set_title('Development of Article System from Latin to Spanish', 
+    ax.set_title('Development of Article System from Latin to Spanish',
                  fontsize=16, fontweight='bold', pad=20)
-    ax.set_ylim(0, 140)
+    top = max(m + e for m, e in zip(means, errors)) or 1.0
+    ax.set_ylim(0, top * 1.4)
     ax.grid(axis='y', alpha=0.3)
-    
-    # Add significance annotation
-    ax.text(2, 120, '***', fontsize=20, ha='center', fontweight='bold')
-    ax.text(2, 115, 'p = 0.0007', fontsize=12, ha='center', style='italic')
-    
+
+    # Add significance annotation over the last period
+    last = len(periods) - 1
+    ax.text(last, top * 1.25, significance(kruskal_p), fontsize=20, ha='center', fontweight='bold')
+    ax.text(last, top * 1.19, f'p = {kruskal_p:.4f}', fontsize=12, ha='center', style='italic')
+
     # Add confidence interval text
-    ax.text(2, 95, '95% CI: [85.8, 122.4]', fontsize=10, ha='center')
-    
+    ci = period_stats[period_keys[last]]['ci']
+    ax.text(last, means[last] * 0.9, f'95% CI: [{ci[0]:.1f}, {ci[1]:.1f}]', fontsize=10, ha='center')
+
     # Improve x-axis labels
     ax.set_xlabel('Historical Period', fontsize=14, fontweight='bold')
     ax.tick_params(axis='both', which='major', labelsize=12)
-    
+
     # Add value labels on bars
     for i, (mean, error) in enumerate(zip(means, errors)):
         if mean > 0:
-            ax.text(i, mean + error + 5, f'{mean:.1f}', 
+            ax.text(i, mean + error + top * 0.04, f'{mean:.1f}',
                    ha='center', va='bottom', fontsize=11, fontweight='bold')
         else:
-            ax.text(i, 5, '0', ha='center', va='bottom', 
+            ax.text(i, top * 0.04, '0', ha='center', va='bottom',
                    fontsize=11, fontweight='bold')
-    
+
     plt.tight_layout()
-    
+
     # Save as PDF for publication
-    plt.savefig('/Users/znielsen/projects/python/linguistics/computation-complexity/display/latin-spanish-complexity/results/figures/figure1_articles.pdf', 
-                dpi=300, bbox_inches='tight')
-    plt.savefig('/Users/znielsen/projects/python/linguistics/computation-complexity/display/latin-spanish-complexity/results/figures/figure1_articles.png', 
-                dpi=300, bbox_inches='tight')
-    
+    fig.savefig(output_dir / 'figure1_articles.pdf', dpi=300, bbox_inches='tight')
+    fig.savefig(output_dir / 'figure1_articles.png', dpi=300, bbox_inches='tight')
+    plt.close(fig)
+
     print("Figure 1 saved: Article Development Across Periods")
-    plt.show()
 
-def create_construction_shift_figure():
+def create_construction_shift_figure(shift_results: dict, output_dir: Path = FIGURES_DIR):
     """Create Figure 2: Analytical vs Synthetic Constructions"""
-    
-    # Data from analysis
-    periods = ['Classical Latin', 'Early Spanish']
-    synthetic_counts = [6182, 0]
-    analytical_counts = [0, 22]
-    
+
+    # Data from the stored analytical shift analysis
+    counts = shift_results['construction_counts']
+    period_keys = [p for p in ('Classical', 'Spanish') if p in counts]
+    periods = [PERIOD_LABELS[p] for p in period_keys]
+    synthetic_counts = [counts[p][0] for p in period_keys]
+    analytical_counts = [counts[p][1] for p in period_keys]
+    fisher_p = shift_results.get('fishers_exact', {}).get('p_value')
+
     # Create figure with side-by-side bars
     fig, ax = plt.subplots(figsize=(12, 8))
-    
+
     x = np.arange(len(periods))
     width = 0.35
-    
+
     # Create bars
-    bars1 = ax.bar(x - width/2, synthetic_counts, width, 
-                   label='Synthetic Constructions', 
+    bars1 = ax.bar(x - width/2, synthetic_counts, width,
+                   label='Synthetic Constructions',
                    color='#4472C4', alpha=0.8, edgecolor='black')
     bars2 = ax.bar(x + width/2, analytical_counts, width,
-                   label='Analytical Constructions', 
+                   label='Analytical Constructions',
                    color='#E76F51', alpha=0.8, edgecolor='black')
-    
+
     # Customize the plot
     ax.set_ylabel('Number of Constructions', fontsize=14, fontweight='bold')
     ax.set_xlabel('Historical Period', fontsize=14, fontweight='bold')
-    ax.set_title('Shift from Synthetic to Analytical Constructions', 
+    ax.set_title('Shift from Synthetic to Analytical Constructions',
                  fontsize=16, fontweight='bold', pad=20)
     ax.set_xticks(x)
     ax.set_xticklabels(periods)
     ax.legend(loc='upper right', fontsize=12)
     ax.grid(axis='y', alpha=0.3)
-    
+
     # Add value labels on bars
+    top = max(synthetic_counts + analytical_counts) or 1
     for bars in [bars1, bars2]:
         for bar in bars:
             height = bar.get_height()
             if height > 0:
-                ax.text(bar.get_x() + bar.get_width()/2., height + 50,
-                       f'{int(height)}', ha='center', va='bottom', 
+                ax.text(bar.get_x() + bar.get_width()/2., height + top * 0.008,
+                       f'{int(height)}', ha='center', va='bottom',
                        fontsize=11, fontweight='bold')
-    
+
     # Add significance annotation
-    ax.text(0.5, 6500, "Fisher's Exact Test", ha='center', 
-            fontsize=12, style='italic')
-    ax.text(0.5, 6200, 'p = 0.0001', ha='center', 
-            fontsize=12, fontweight='bold')
-    ax.text(0.5, 5900, 'Complete Structural Transition', ha='center', 
-            fontsize=11)
-    
+    if fisher_p is not None:
+        center = (len(periods) - 1) / 2
+        ax.text(center, top * 1.05, "Fisher's Exact Test", ha='center',
+                fontsize=12, style='italic')
+        ax.text(center, top * 1.0, f'p = {fisher_p:.4f}', ha='center',
+                fontsize=12, fontweight='bold')
+
     # Set y-axis to accommodate both scales
-    ax.set_ylim(0, 6800)
-    
+    ax.set_ylim(0, top * 1.1)
+
     plt.tight_layout()
-    
+
     # Save as PDF for publication
-    plt.savefig('/Users/znielsen/projects/python/linguistics/computation-complexity/display/latin-spanish-complexity/results/figures/figure2_constructions.pdf', 
-                dpi=300, bbox_inches='tight')
-    plt.savefig('/Users/znielsen/projects/python/linguistics/computation-complexity/display/latin-spanish-complexity/results/figures/figure2_constructions.png', 
-                dpi=300, bbox_inches='tight')
-    
+    fig.savefig(output_dir / 'figure2_constructions.pdf', dpi=300, bbox_inches='tight')
+    fig.savefig(output_dir / 'figure2_constructions.png', dpi=300, bbox_inches='tight')
+    plt.close(fig)
+
     print("Figure 2 saved: Analytical vs Synthetic Constructions")
-    plt.show()
 
-def create_summary_stats_table():
+def create_summary_stats_table(statistics: dict, output_dir: Path = TABLES_DIR):
     """Create a summary table of key statistical results"""
-    
-    import pandas as pd
-    
-    # Key results from the analysis
-    results_data = {
-        'Measure': [
-            'Article Development',
-            'Article Development', 
-            'Article Development',
-            'Construction Shift',
-            'Dependency Complexity'
-        ],
-        'Period': [
-            'Classical Latin',
-            'Medieval Latin',
-            'Early Spanish', 
-            'Classical → Spanish',
-            'All Periods'
-        ],
-        'Value': [
-            '0.000 ± 0.000',
-            '0.000 ± 0.000',
-            '107.018 ± 22.970',
-            '6,182 → 22',
-            'Non-significant'
-        ],
-        'Statistical_Test': [
-            'Kruskal-Wallis H = 14.619',
-            'Kruskal-Wallis H = 14.619',
-            'Kruskal-Wallis H = 14.619',
-            "Fisher's Exact Test",
-            'Kruskal-Wallis H = 4.343'
-        ],
-        'P_Value': [
-            '0.0007',
-            '0.0007',
-            '0.0007',
-            '0.0001',
-            '0.1140'
-        ],
-        'Significance': [
-            '***',
-            '***', 
-            '***',
-            '***',
-            'ns'
-        ]
-    }
-    
-    df = pd.DataFrame(results_data)
-    
+
+    articles = statistics['article_development']
+    shift = statistics['analytical_shift']
+    dependency = statistics['dependency_evolution']
+    rows = []
+
+    # Article rates per period, all sharing the Kruskal-Wallis test
+    kw = articles['non_parametric']['kruskal_wallis']
+    for period, period_stats in articles['period_stats'].items():
+        rows.append({
+            'Measure': 'Article Development',
+            'Period': PERIOD_LABELS[period],
+            'Value': f"{period_stats['mean']:.3f} ± {period_stats['std']:.3f}",
+            'Statistical_Test': f"Kruskal-Wallis H = {kw['h_stat']:.3f}",
+            'P_Value': f"{kw['p_value']:.4f}",
+            'Significance': significance(kw['p_value'])
+        })
+
+    counts = shift['construction_counts']
+    if 'fishers_exact' in shift and 'Classical' in counts and 'Spanish' in counts:
+        fisher_p = shift['fishers_exact']['p_value']
+        rows.append({
+            'Measure': 'Construction Shift',
+            'Period': 'Classical → Spanish',
+            'Value': f"{counts['Classical'][0]:,} → {counts['Spanish'][1]:,}",
+            'Statistical_Test': "Fisher's Exact Test",
+            'P_Value': f"{fisher_p:.4f}",
+            'Significance': significance(fisher_p)
+        })
+
+    kw = dependency['non_parametric']['kruskal_wallis']
+    rows.append({
+        'Measure': 'Dependency Complexity',
+        'Period': 'All Periods',
+        'Value': 'Significant' if kw['p_value'] < 0.05 else 'Non-significant',
+        'Statistical_Test': f"Kruskal-Wallis H = {kw['h_stat']:.3f}",
+        'P_Value': f"{kw['p_value']:.4f}",
+        'Significance': significance(kw['p_value'])
+    })
+
+    df = pd.DataFrame(rows)
+
     # Save as CSV
-    df.to_csv('/Users/znielsen/projects/python/linguistics/computation-complexity/display/latin-spanish-complexity/results/tables/statistical_summary.csv', 
-              index=False)
-    
+    df.to_csv(output_dir / 'statistical_summary.csv', index=False)
+
     print("Statistical summary table saved")
     return df
 
+# Each output: the statistics it reads, its builder, its output directory
+# and the files it writes
+OUTPUTS = {
+    'figure1_articles': (('article_development',),
+                         lambda s: create_article_development_figure(s['article_development']),
+                         FIGURES_DIR, ('figure1_articles.pdf', 'figure1_articles.png')),
+    'figure2_constructions': (('analytical_shift',),
+                              lambda s: create_construction_shift_figure(s['analytical_shift']),
+                              FIGURES_DIR, ('figure2_constructions.pdf', 'figure2_constructions.png')),
+    'statistical_summary': (('article_development', 'analytical_shift', 'dependency_evolution'),
+                            create_summary_stats_table,
+                            TABLES_DIR, ('statistical_summary.csv',))
+}
+
+def unusable_inputs(statistics: dict, analyses) -> list:
+    """
+    Why an output's inputs cannot be rendered: a missing analysis, or one
+    stored as an {'error': ...} payload (e.g. fewer than two periods with
+    data). Empty when every input is usable.
+    """
+    problems = []
+    for analysis in analyses:
+        result = statistics.get(analysis)
+        if result is None:
+            problems.append(f"{analysis} not in the results store")
+        elif 'error' in result:
+            problems.append(f"{analysis}: {result['error']}")
+    return problems
+
+def input_hash(statistics: dict, analyses) -> str:
+    """Hash of an output's inputs and of this script, which renders them"""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    for analysis in analyses:
+        digest.update(json.dumps(statistics[analysis], sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+def render_all(db_path: Path = RESULTS_DB, force: bool = False) -> list:
+    """
+    Render every figure and table from the stored statistics in one batch.
+
+    An output is skipped when its input hash matches the render manifest and
+    its files still exist, or, with a message, when one of its analyses
+    failed (see unusable_inputs). Returns the names of the outputs rendered.
+    """
+    statistics = load_statistics(db_path)
+    try:
+        manifest = json.loads(RENDER_MANIFEST.read_text())
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+
+    rendered = []
+    for name, (analyses, build, output_dir, files) in OUTPUTS.items():
+        problems = unusable_inputs(statistics, analyses)
+        if problems:
+            print(f"{name} skipped: {'; '.join(problems)}")
+            continue
+        digest = input_hash(statistics, analyses)
+        if (not force and manifest.get(name) == digest
+                and all((output_dir / f).exists() for f in files)):
+            print(f"{name} unchanged, skipping")
+            continue
+        output_dir.mkdir(parents=True, exist_ok=True)
+        result = build(statistics)
+        if isinstance(result, pd.DataFrame):
+            print("Summary of key results:")
+            print(result)
+        manifest[name] = digest
+        rendered.append(name)
+
+    RENDER_MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    RENDER_MANIFEST.write_text(json.dumps(manifest, indent=2))
+    return rendered
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the paper's figures and tables from the results store")
+    parser.add_argument('--db', type=Path, default=RESULTS_DB, help="results store written by 02_nlp_analysis.py")
+    parser.add_argument('--force', action='store_true', help="re-render even if the inputs are unchanged")
+    args = parser.parse_args()
+
     print("Creating figures for Latin-Spanish complexity conservation paper...")
     print("=" * 60)
-    
-    # Create both figures
-    create_article_development_figure()
-    print()
-    create_construction_shift_figure()
-    print()
-    
-    # Create summary table
-    summary_df = create_summary_stats_table()
-    print()
-    print("Summary of key results:")
-    print(summary_df)
-    
-    print("\nAll figures and tables created successfully!")
-    print("Files saved in /results/figures/ and /results/tables/")
\ No newline at end of file
+
+    rendered = render_all(args.db, args.force)
+
+    print(f"\n{len(rendered)} of {len(OUTPUTS)} figures and tables rendered")
+    print(f"Files saved in {FIGURES_DIR} and {TABLES_DIR}")
@@ -0,0 +1,178 @@
+"""
+Shared fixtures: 02_nlp_analysis loaded against a stub stanza.
+
+The stub parses deterministically and offline (regex tokens, a small
+lexicon for UPOS and feats, every word attached to the first one) and
+records every text its pipelines process, so tests can check which texts
+were (re)parsed without any Stanza model.
+"""
+import importlib.util
+import json
+import re
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+CODE_DIR = Path(__file__).resolve().parent.parent / "code"
+
+LEXICON = {
+    'el': ('DET', None), 'la': ('DET', None), 'los': ('DET', None), 'las': ('DET', None),
+    'un': ('DET', None), 'una': ('DET', None),
+    'de': ('ADP', None), 'a': ('ADP', None), 'en': ('ADP', None), 'in': ('ADP', None),
+    'ad': ('ADP', None), 'cum': ('ADP', None),
+    'he': ('AUX', None), 'ha': ('AUX', None), 'es': ('AUX', None), 'va': ('AUX', None),
+    'que': ('SCONJ', None), 'et': ('CCONJ', None), 'y': ('CCONJ', None),
+    'amabit': ('VERB', 'Tense=Fut|Mood=Ind'), 'amavit': ('VERB', 'Tense=Perf|Mood=Ind'),
+    'amatur': ('VERB', 'Voice=Pass'), 'amata': ('VERB', 'Case=Abl|VerbForm=Part'),
+    'cantado': ('VERB', 'VerbForm=Part'), 'cantar': ('VERB', 'VerbForm=Inf'),
+    'cantando': ('VERB', 'VerbForm=Ger'), 'canta': ('VERB', 'Mood=Ind'),
+    '.': ('PUNCT', None)
+}
+
+
+class Word:
+    def __init__(self, sent, entry):
+        self.sent = sent
+        self.id = entry['id']
+        self.text = entry['text']
+        self.lemma = entry.get('lemma')
+        self.upos = entry.get('upos')
+        self.xpos = entry.get('xpos')
+        self.feats = entry.get('feats')
+        self.head = entry.get('head')
+        self.deprel = entry.get('deprel')
+
+    def to_dict(self):
+        return {key: getattr(self, key)
+                for key in ('id', 'text', 'lemma', 'upos', 'xpos', 'feats', 'head', 'deprel')
+                if getattr(self, key) is not None}
+
+
+class Sentence:
+    def __init__(self, doc, entries):
+        self.doc = doc
+        self.words = [Word(self, entry) for entry in entries]
+        self.tokens = self.words
+        self.text = ' '.join(word.text for word in self.words)
+
+    def to_dict(self):
+        return [word.to_dict() for word in self.words]
+
+
+class Document:
+    def __init__(self, sentences, text=None):
+        self.text = text
+        self.sentences = [Sentence(self, entries) for entries in sentences]
+
+    def to_dict(self):
+        return [sent.to_dict() for sent in self.sentences]
+
+
+def parse_tokens(tokens, processors):
+    """Word dicts of one sentence, with only the layers the processors add"""
+    entries = []
+    for i, token in enumerate(tokens, 1):
+        entry = {'id': i, 'text': token}
+        upos, feats = LEXICON.get(token.lower(), ('NOUN', None))
+        if 'pos' in processors:
+            entry['upos'] = upos
+            if feats:
+                entry['feats'] = feats
+        if 'lemma' in processors:
+            entry['lemma'] = token.lower()
+        if 'depparse' in processors:
+            entry['head'] = 0 if i == 1 else 1
+            entry['deprel'] = 'root' if i == 1 else {'DET': 'det', 'ADP': 'case'}.get(upos, 'nsubj')
+        entries.append(entry)
+    return entries
+
+
+class Pipeline:
+    # (language, text) of every text any stub pipeline processed
+    calls = []
+
+    def __init__(self, lang='la', processors='tokenize,mwt,pos,lemma,depparse', **options):
+        self.lang = lang
+        self.processors = set(processors.split(','))
+        self.pretokenized = options.get('tokenize_pretokenized', False)
+
+    def _process(self, text):
+        if self.pretokenized:
+            sentences = text
+            text = '\n'.join(' '.join(tokens) for tokens in sentences)
+        else:
+            sentences = [tokens for tokens in (re.findall(r"\w+|[^\w\s]", chunk)
+                                               for chunk in re.split(r'(?<=[.!?])\s+|\n\s*\n', text))
+                         if tokens]
+        self.calls.append((self.lang, text))
+        return Document([parse_tokens(tokens, self.processors) for tokens in sentences], text=text)
+
+    def __call__(self, text):
+        return self._process(text)
+
+    def bulk_process(self, docs):
+        return [self._process(doc.text) for doc in docs]
+
+
+stanza = types.ModuleType('stanza')
+stanza.__version__ = '0.0-stub'
+stanza.Document = Document
+stanza.Pipeline = Pipeline
+sys.modules['stanza'] = stanza
+
+_spec = importlib.util.spec_from_file_location("nlp_analysis", CODE_DIR / "02_nlp_analysis.py")
+nlp_analysis = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(nlp_analysis)
+
+
+@pytest.fixture
+def nlp():
+    return nlp_analysis
+
+
+@pytest.fixture
+def parses():
+    """The (language, text) pairs parsed during the test"""
+    Pipeline.calls.clear()
+    return Pipeline.calls
+
+
+@pytest.fixture
+def make_doc():
+    """Build a Document from per-sentence lists of word dicts"""
+    return lambda sentences: Document(sentences)
+
+
+CORPUS_TEXTS = {
+    'latin_gallia': ('Classical', 'la', "Caesar amabit Galliam. Miles in castra amavit."),
+    'medieval_vita': ('Medieval', 'la', "Deus amatur. Terra amata cum monachis."),
+    'spanish_cid': ('Spanish', 'es', "El rey ha cantado en la villa. Va a cantar que canta.")
+}
+
+
+def write_manifest(corpus_dir, entries):
+    with open(corpus_dir / "manifest.json", 'w', encoding='utf-8') as f:
+        json.dump({'texts': entries}, f)
+
+
+@pytest.fixture
+def corpus_dir(tmp_path):
+    """A three-text corpus with a manifest, one text per period"""
+    corpus_dir = tmp_path / "corpus"
+    corpus_dir.mkdir()
+    entries = []
+    for text_id, (period, language, text) in CORPUS_TEXTS.items():
+        (corpus_dir / f"{text_id}.txt").write_text(text, encoding='utf-8')
+        entries.append({'id': text_id, 'period': period, 'language': language,
+                        'path': f"{text_id}.txt", 'source': 'stub', 'date': None})
+    write_manifest(corpus_dir, entries)
+    return corpus_dir
+
+
+@pytest.fixture
+def tracker(tmp_path, corpus_dir):
+    """Tracker over corpus_dir with a fresh results store and no parse cache"""
+    return nlp_analysis.EnhancedComplexityTracker(cache_dir=None, results_db=tmp_path / "results.sqlite",
+                                                  corpus_dir=corpus_dir)
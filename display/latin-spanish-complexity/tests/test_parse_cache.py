@@ -0,0 +1,67 @@
+"""ParseCache round trips, keys and LRU eviction"""
+import os
+
+import pytest
+
+
+@pytest.fixture
+def doc(make_doc):
+    return make_doc([[{'id': 1, 'text': 'Arma', 'upos': 'NOUN', 'head': 0, 'deprel': 'root'},
+                      {'id': 2, 'text': 'virumque', 'upos': 'NOUN', 'feats': 'Case=Acc',
+                       'head': 1, 'deprel': 'conj'}]])
+
+
+def test_round_trip(nlp, tmp_path, doc):
+    cache = nlp.ParseCache(tmp_path / "cache")
+    key = cache.key("Arma virumque", 'la')
+    assert cache.get(key, "Arma virumque") is None
+    cache.put(key, doc)
+    cached = cache.get(key, "Arma virumque")
+    assert cached.text == "Arma virumque"
+    assert cached.to_dict() == doc.to_dict()
+
+
+def test_key_depends_on_language_and_processors(nlp, tmp_path):
+    cache = nlp.ParseCache(tmp_path / "cache")
+    keys = {cache.key("texto", 'es'), cache.key("texto", 'la'),
+            cache.key("texto", 'es', 'tokenize,pos'), cache.key("texto ", 'es')}
+    assert len(keys) == 4
+
+
+def test_corrupt_entry_is_a_miss(nlp, tmp_path, doc):
+    cache = nlp.ParseCache(tmp_path / "cache")
+    key = cache.key("Arma virumque", 'la')
+    cache.put(key, doc)
+    cache._path(key).write_bytes(b"not gzip")
+    assert cache.get(key, "Arma virumque") is None
+
+
+def test_eviction_keeps_recent_entries_within_budget(nlp, tmp_path, make_doc):
+    cache = nlp.ParseCache(tmp_path / "cache")
+    entry_size = None
+    keys = []
+    for i in range(12):
+        doc = make_doc([[{'id': 1, 'text': f"verbum{i:03d}" * 50, 'upos': 'NOUN'}]])
+        keys.append(cache.key(f"text {i}", 'la'))
+        cache.put(keys[-1], doc)
+        path = cache._path(keys[-1])
+        # Spread the mtimes so recency is unambiguous
+        os.utime(path, (1000 + i, 1000 + i))
+        if entry_size is None:
+            entry_size = path.stat().st_size
+            cache.max_bytes = entry_size * 5
+    cache.evict()
+    sizes = [path.stat().st_size for path in (tmp_path / "cache").glob("*/*.json.gz")]
+    assert sum(sizes) <= cache.max_bytes
+    assert cache.get(keys[-1], "text 11") is not None
+    assert cache.get(keys[0], "text 0") is None
+
+
+def test_tracker_parses_cache_misses_only(nlp, tmp_path, parses):
+    tracker = nlp.EnhancedComplexityTracker(cache_dir=tmp_path / "cache", results_db=None,
+                                            corpus_dir=tmp_path)
+    tracker.parse_many(["Caesar amabit.", "Deus amatur."], 'la')
+    parses.clear()
+    docs = tracker.parse_many(["Caesar amabit.", "Miles venit."], 'la')
+    assert [text for _, text in parses] == ["Miles venit."]
+    assert [doc.text for doc in docs] == ["Caesar amabit.", "Miles venit."]
@@ -0,0 +1,213 @@
+"""
+The pattern engine and the construction/function-word patterns.
+
+The reference_* functions are the hand-written detectors the patterns
+replaced; the patterns must label every word of randomly generated parses
+exactly as they did.
+"""
+import random
+
+import pytest
+
+FUTURE_AUX = ('ir', 'voy', 'vas', 'va')
+PERFECT_AUX = ('he', 'has', 'ha', 'hemos')
+PASSIVE_AUX = ('ser', 'es', 'son')
+
+
+def reference_construction(nlp, word, words, language):
+    """(construction, form, main verb id or None), or None"""
+    feats = nlp.feats_mask(word.feats)
+    if language == 'la' and word.upos == 'VERB':
+        if feats & nlp.TENSE_FUT:
+            return 'future_tense', 'synthetic', None
+        elif feats & nlp.TENSE_PERF:
+            return 'perfect_tense', 'synthetic', None
+        elif feats & nlp.VOICE_PASS:
+            return 'passive_voice', 'synthetic', None
+    elif language == 'es' and word.upos == 'AUX':
+        verb = next((w for w in words[word.id:] if w.upos == 'VERB'), None)
+        if verb is None:
+            return None
+        aux = word.text.lower()
+        verb_feats = nlp.feats_mask(verb.feats)
+        if aux in FUTURE_AUX and 'a' in {w.text.lower() for w in words}:
+            return 'future_tense', 'analytic', verb.id
+        elif aux in PERFECT_AUX and verb_feats & nlp.VERBFORM_PART:
+            return 'perfect_tense', 'analytic', verb.id
+        elif aux in PASSIVE_AUX and verb_feats & nlp.VERBFORM_PART:
+            return 'passive_voice', 'analytic', verb.id
+    return None
+
+
+def reference_clause(nlp, word, language):
+    feats = nlp.feats_mask(word.feats)
+    if language == 'la':
+        if feats & nlp.CASE_ABL and feats & nlp.VERBFORM_PART:
+            return 'ablative_absolute', 'other'
+        elif feats & nlp.VERBFORM_PART:
+            return 'participial_constructions', 'other'
+        return None
+    if word.text.lower() == 'que' and word.upos == 'SCONJ':
+        return 'subordination_strategies', 'que_clauses'
+    elif feats & nlp.VERBFORM_GER:
+        return 'subordination_strategies', 'gerund_clauses'
+    elif feats & nlp.VERBFORM_INF:
+        return 'subordination_strategies', 'infinitive_clauses'
+    elif word.deprel == 'acl:relcl':
+        return 'subordination_strategies', 'relative_clauses'
+    return None
+
+
+def reference_preposition(word, words):
+    child_deprels = {w.deprel for w in words if w.head == word.id}
+    form = word.text.lower()
+    if form == 'de':
+        if 'nmod' in child_deprels:
+            return 'case_replacement'
+    elif form in ('en', 'sobre', 'bajo'):
+        return 'semantic'
+    elif form in ('a', 'para', 'por'):
+        if 'iobj' in child_deprels:
+            return 'case_replacement'
+        return 'semantic'
+    if form in ('in', 'ad', 'ex', 'ab', 'cum'):
+        return 'semantic'
+    return 'other'
+
+
+def reference_article(word, words, language):
+    if language == 'la':
+        return 'not_article'
+    form = word.text.lower()
+    if form in ('el', 'la', 'los', 'las'):
+        if {w.deprel for w in words if w.head == word.head} & {'nsubj', 'obj'}:
+            return 'case_marking'
+        return 'definiteness'
+    elif form in ('un', 'una', 'unos', 'unas'):
+        return 'definiteness'
+    return 'other'
+
+
+FORMS = ('de', 'en', 'sobre', 'bajo', 'a', 'para', 'por', 'in', 'ad', 'ex', 'ab', 'cum',
+         'el', 'la', 'los', 'las', 'un', 'una', 'unos', 'unas', 'que') + FUTURE_AUX + PERFECT_AUX + PASSIVE_AUX
+OPEN_FORMS = ('rex', 'villa', 'cantado', 'amat', 'dicho')
+UPOS = ('VERB', 'AUX', 'ADP', 'DET', 'SCONJ', 'NOUN', 'ADJ', 'PRON')
+FEATS = (None, 'Tense=Fut', 'Tense=Perf|Mood=Ind', 'Voice=Pass', 'Case=Abl|VerbForm=Part',
+         'VerbForm=Part', 'Gender=Masc|VerbForm=Part', 'VerbForm=Ger', 'VerbForm=Inf',
+         'Tense=Fut|Voice=Pass', 'Case=Nom|Number=Sing')
+DEPRELS = ('nmod', 'iobj', 'nsubj', 'obj', 'acl:relcl', 'det', 'case', 'obl', 'advmod')
+
+
+def random_sentence(rng):
+    """Word dicts of a random but well-formed parse: one root, heads in range"""
+    n = rng.randint(1, 12)
+    root = rng.randint(1, n)
+    words = []
+    for i in range(1, n + 1):
+        word = {'id': i, 'text': rng.choice(FORMS if rng.random() < 0.6 else OPEN_FORMS),
+                'upos': rng.choice(UPOS)}
+        if rng.random() < 0.2:
+            word['text'] = word['text'].capitalize()
+        feats = rng.choice(FEATS)
+        if feats:
+            word['feats'] = feats
+        if i == root:
+            word['head'], word['deprel'] = 0, 'root'
+        else:
+            word['head'] = rng.choice([j for j in range(1, n + 1) if j != i])
+            word['deprel'] = rng.choice(DEPRELS)
+        words.append(word)
+    return words
+
+
+@pytest.fixture
+def random_doc(make_doc):
+    rng = random.Random(25)
+    return make_doc([random_sentence(rng) for _ in range(3000)])
+
+
+@pytest.mark.parametrize('language', ['la', 'es'])
+def test_patterns_match_hand_written_detectors(nlp, random_doc, language):
+    tracker = nlp.EnhancedComplexityTracker(cache_dir=None, results_db=None)
+    for sent in random_doc.sentences:
+        words = sent.words
+        labels = tracker._sentence_labels(sent, language)
+        for word in words:
+            found = labels['construction'].get(word.id)
+            if found is None:
+                actual = None
+            else:
+                (construction, form), binding = found
+                verb = binding.get('verb')
+                actual = construction, form, verb.id if verb is not None else None
+            assert actual == reference_construction(nlp, word, words, language), sent.to_dict()
+
+            found = labels['clause'].get(word.id)
+            assert (found[0] if found else None) == reference_clause(nlp, word, language), sent.to_dict()
+
+            if word.upos == 'ADP':
+                assert tracker._classify_preposition(word, sent, language=language) == \
+                    reference_preposition(word, words), sent.to_dict()
+            elif word.upos == 'DET':
+                assert tracker._classify_article(word, sent, language) == \
+                    reference_article(word, words, language), sent.to_dict()
+
+
+@pytest.fixture
+def sentence(make_doc):
+    # "el rey ha cantado a la villa": rey <nsubj cantado, villa <obl cantado
+    words = [('el', 'DET', 2, 'det'), ('rey', 'NOUN', 4, 'nsubj'), ('ha', 'AUX', 4, 'aux'),
+             ('cantado', 'VERB', 0, 'root'), ('a', 'ADP', 7, 'case'), ('la', 'DET', 7, 'det'),
+             ('villa', 'NOUN', 4, 'obl')]
+    doc = make_doc([[{'id': i, 'text': text, 'upos': upos, 'head': head, 'deprel': deprel,
+                      **({'feats': 'VerbForm=Part'} if text == 'cantado' else {})}
+                     for i, (text, upos, head, deprel) in enumerate(words, 1)]])
+    return doc.sentences[0]
+
+
+def ids(nlp, source, sentence):
+    return [word.id for word, _ in nlp.Pattern(source).matches(nlp.SentenceIndex.of(sentence))]
+
+
+@pytest.mark.parametrize('source, expected', [
+    ('{upos:DET}', [1, 6]),
+    ('{lower:el|villa}', [1, 7]),
+    ('{!upos:NOUN|DET}', [3, 4, 5]),
+    ('{feats:VerbForm=Part}', [4]),
+    ('{upos:VERB} >nsubj {}', [4]),
+    ('{} <obl {upos:VERB}', [7]),
+    ('{upos:DET} < ({} >nsubj|obj {})', []),
+    ('{upos:NOUN} < ({} >nsubj {})', [2, 7]),
+    ('{upos:DET} $ {upos:ADP}', [6]),
+    ('{upos:AUX} . {upos:VERB}', [3]),
+    ('{upos:AUX} ..VERB {feats:VerbForm=Part}', [3]),
+    ('{upos:DET} ..2 {upos:AUX}', [1]),
+    ('{upos:DET} .. {lower:villa}', [1, 6]),
+    ('{upos:ADP} ~ {lower:rey}', [5]),
+])
+def test_pattern_relations(nlp, sentence, source, expected):
+    assert ids(nlp, source, sentence) == expected
+
+
+def test_bindings(nlp, sentence):
+    pattern = nlp.Pattern('{upos:AUX}=aux ..VERB {}=verb')
+    [(_, binding)] = pattern.matches(nlp.SentenceIndex.of(sentence))
+    assert (binding['aux'].text, binding['verb'].text) == ('ha', 'cantado')
+
+
+@pytest.mark.parametrize('source', ['{upos:VERB} >', '({upos:VERB}', '{colour:red}', '{upos:VERB} {}'])
+def test_bad_patterns_raise(nlp, source):
+    with pytest.raises(ValueError):
+        nlp.Pattern(source)
+
+
+def test_pattern_set_first_rule_wins(nlp, sentence):
+    patterns = nlp.PatternSet([('article', 'definite', '{lower:el}'),
+                               ('article', 'any', '{upos:DET}'),
+                               ('verb', 'main', '{upos:VERB}')])
+    labels = patterns.classify(sentence)
+    assert {word_id: label for word_id, (label, _) in labels['article'].items()} == {1: 'definite', 6: 'any'}
+    assert list(labels['verb']) == [4]
+    assert patterns.anchor_forms('article') is None
+    assert nlp.PatternSet(nlp.CONSTRUCTION_PATTERNS['es']).anchor_forms('construction') == \
+        frozenset(FUTURE_AUX + PERFECT_AUX + PASSIVE_AUX)
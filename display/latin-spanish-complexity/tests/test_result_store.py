@@ -0,0 +1,121 @@
+"""ResultStore incrementality: which texts analyze_full_corpus re-analyzes"""
+import json
+import os
+
+from conftest import CORPUS_TEXTS, write_manifest
+
+
+def parsed_texts(parses, corpus_dir):
+    """Ids of the corpus texts whose content went through a pipeline"""
+    contents = {text_id: (corpus_dir / f"{text_id}.txt").read_text(encoding='utf-8')
+                for text_id in CORPUS_TEXTS}
+    return {text_id for text_id, content in contents.items()
+            if any(text == content for _, text in parses)}
+
+
+def relabel(corpus_dir, text_id, **changes):
+    manifest_path = corpus_dir / "manifest.json"
+    entries = json.loads(manifest_path.read_text(encoding='utf-8'))['texts']
+    for entry in entries:
+        if entry['id'] == text_id:
+            entry.update(changes)
+    write_manifest(corpus_dir, entries)
+
+
+def test_first_run_analyzes_every_text(tracker, parses, corpus_dir):
+    results = tracker.analyze_full_corpus()
+    assert list(results) == list(CORPUS_TEXTS)
+    assert parsed_texts(parses, corpus_dir) == set(CORPUS_TEXTS)
+
+
+def test_rerun_reuses_stored_results(tracker, parses):
+    first = tracker.analyze_full_corpus()
+    parses.clear()
+    second = tracker.analyze_full_corpus()
+    assert parses == []
+    assert json.dumps(second, sort_keys=True, default=str) == json.dumps(first, sort_keys=True, default=str)
+
+
+def test_edited_text_is_reanalyzed_alone(tracker, parses, corpus_dir):
+    tracker.analyze_full_corpus()
+    parses.clear()
+    with open(corpus_dir / "spanish_cid.txt", 'a', encoding='utf-8') as f:
+        f.write(" El rey canta.")
+    tracker.analyze_full_corpus()
+    assert parsed_texts(parses, corpus_dir) == {'spanish_cid'}
+
+
+def test_touched_text_is_not_reanalyzed(tracker, parses, corpus_dir):
+    tracker.analyze_full_corpus()
+    parses.clear()
+    path = corpus_dir / "latin_gallia.txt"
+    st = path.stat()
+    os.utime(path, (st.st_atime + 10, st.st_mtime + 10))
+    tracker.analyze_full_corpus()
+    assert parses == []
+
+
+def test_settings_change_reanalyzes(tracker, parses, corpus_dir):
+    tracker.analyze_full_corpus()
+    parses.clear()
+    tracker.analyze_full_corpus(chunk_chars=5000)
+    assert parsed_texts(parses, corpus_dir) == set(CORPUS_TEXTS)
+
+
+def test_analyzer_version_bump_reanalyzes(nlp, monkeypatch, tracker, parses, corpus_dir):
+    tracker.analyze_full_corpus()
+    parses.clear()
+    monkeypatch.setattr(nlp, 'ANALYZER_VERSION', nlp.ANALYZER_VERSION + 1)
+    tracker.analyze_full_corpus()
+    assert parsed_texts(parses, corpus_dir) == set(CORPUS_TEXTS)
+
+
+def test_language_relabel_reanalyzes_with_new_pipeline(nlp, tracker, parses, corpus_dir):
+    tracker.analyze_full_corpus()
+    parses.clear()
+    relabel(corpus_dir, 'medieval_vita', language='es')
+    results = tracker.analyze_full_corpus()
+    assert parsed_texts(parses, corpus_dir) == {'medieval_vita'}
+    assert {language for language, _ in parses} == {'es'}
+    assert results['medieval_vita']['metadata']['language'] == 'es'
+    assert nlp.ResultStore(tracker.results_db).manifest['medieval_vita']['language'] == 'es'
+
+
+def test_period_relabel_reanalyzes_and_updates_store(nlp, tracker, parses, corpus_dir):
+    tracker.analyze_full_corpus()
+    parses.clear()
+    relabel(corpus_dir, 'medieval_vita', period='Classical')
+    tracker.analyze_full_corpus()
+    assert parsed_texts(parses, corpus_dir) == {'medieval_vita'}
+    assert nlp.load_results(tracker.results_db)['medieval_vita']['metadata']['period'] == 'Classical'
+    periods = nlp.load_metrics(tracker.results_db).groupby('text_name')['period'].first()
+    assert periods['medieval_vita'] == 'Classical'
+
+
+def test_source_change_updates_metadata_without_reanalysis(nlp, tracker, parses, corpus_dir):
+    tracker.analyze_full_corpus()
+    parses.clear()
+    relabel(corpus_dir, 'latin_gallia', source='Perseus')
+    tracker.analyze_full_corpus()
+    assert parses == []
+    assert nlp.load_results(tracker.results_db)['latin_gallia']['metadata']['source'] == 'Perseus'
+
+
+def test_removed_text_is_pruned(nlp, tracker, corpus_dir):
+    tracker.analyze_full_corpus()
+    entries = json.loads((corpus_dir / "manifest.json").read_text(encoding='utf-8'))['texts']
+    write_manifest(corpus_dir, [entry for entry in entries if entry['id'] != 'spanish_cid'])
+    tracker.analyze_full_corpus()
+    assert set(nlp.load_results(tracker.results_db)) == {'latin_gallia', 'medieval_vita'}
+
+
+def test_filtered_run_keeps_and_records_whole_corpus(nlp, tracker, parses, corpus_dir):
+    tracker.analyze_full_corpus()
+    parses.clear()
+    with open(corpus_dir / "spanish_cid.txt", 'a', encoding='utf-8') as f:
+        f.write(" La villa es grande.")
+    results = tracker.analyze_full_corpus(period='Spanish')
+    assert list(results) == ['spanish_cid']
+    assert parsed_texts(parses, corpus_dir) == {'spanish_cid'}
+    assert set(nlp.load_results(tracker.results_db)) == set(CORPUS_TEXTS)
+    assert set(nlp.load_metrics(tracker.results_db)['text_name']) == set(CORPUS_TEXTS)
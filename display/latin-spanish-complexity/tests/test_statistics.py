@@ -0,0 +1,107 @@
+"""BootstrapEngine and PermutationTest against direct computations"""
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(7)
+    return {'classical': rng.normal(0.30, 0.05, 12), 'medieval': rng.normal(0.25, 0.05, 12),
+            'spanish': rng.normal(0.10, 0.04, 9), 'empty': []}
+
+
+def test_ci_is_the_seeded_percentile_bootstrap(nlp, samples):
+    data = samples['classical']
+    engine = nlp.BootstrapEngine(n_bootstrap=2000, seed=3)
+    indices = np.random.default_rng(3).integers(0, len(data), size=(2000, len(data)))
+    expected = np.percentile(data[indices].mean(axis=1), [2.5, 97.5])
+    np.testing.assert_allclose(engine.ci(data), expected)
+
+
+def test_ci_does_not_depend_on_chunking(nlp, samples):
+    data = samples['spanish']
+    whole = nlp.BootstrapEngine(n_bootstrap=3000).ci(data)
+    chunked = nlp.BootstrapEngine(n_bootstrap=3000, chunk_elements=50).ci(data)
+    np.testing.assert_allclose(chunked, whole)
+
+
+@pytest.mark.parametrize('method', ['percentile', 'bca'])
+def test_batch_ci_matches_single_calls(nlp, samples, method):
+    engine = nlp.BootstrapEngine(n_bootstrap=2000, method=method)
+    batched = engine.batch_ci(samples)
+    assert list(batched) == list(samples)
+    for key, data in samples.items():
+        if len(data):
+            np.testing.assert_allclose(batched[key], engine.ci(data))
+            assert batched[key][0] <= np.mean(data) <= batched[key][1]
+    assert np.isnan(batched['empty']).all()
+
+
+def test_constant_sample_gives_degenerate_interval(nlp):
+    for method in ('percentile', 'bca'):
+        np.testing.assert_allclose(nlp.BootstrapEngine(n_bootstrap=500, method=method).ci([0.4] * 6),
+                                   [0.4, 0.4])
+
+
+def test_unknown_method_raises(nlp):
+    with pytest.raises(ValueError):
+        nlp.BootstrapEngine(method='basic')
+
+
+def test_hierarchical_ratios(nlp):
+    engine = nlp.BootstrapEngine(n_bootstrap=4000, chunk_elements=64)
+    denominators = [np.array([10, 12, 8]), np.array([20, 5]), np.array([7, 7, 7, 7])]
+    # A constant per-sentence ratio survives any resampling
+    ratios = engine.hierarchical_ratios([2 * d for d in denominators], denominators)
+    np.testing.assert_allclose(ratios, 2.0)
+
+    numerators = [np.array([1, 6, 2]), np.array([9, 0]), np.array([3, 1, 4, 1])]
+    ratios = engine.hierarchical_ratios(numerators, denominators)
+    pooled = sum(n.sum() for n in numerators) / sum(d.sum() for d in denominators)
+    assert ratios.shape == (4000,)
+    assert abs(np.median(ratios) - pooled) < 0.05
+    np.testing.assert_array_equal(ratios, engine.hierarchical_ratios(numerators, denominators))
+
+
+def brute_force_p(x, y):
+    pooled = np.concatenate([x, y])
+    observed = abs(np.mean(x) - np.mean(y))
+    extreme = 0
+    for group in itertools.combinations(range(len(pooled)), len(x)):
+        mask = np.zeros(len(pooled), dtype=bool)
+        mask[list(group)] = True
+        extreme += abs(pooled[mask].mean() - pooled[~mask].mean()) >= observed - 1e-12
+    return extreme / math.comb(len(pooled), len(x))
+
+
+def test_exact_permutation_p_value(nlp, samples):
+    x, y = samples['classical'][:7], samples['medieval'][:6]
+    result = nlp.PermutationTest(chunk_elements=100).test(x, y)
+    assert result['method'] == 'exact'
+    assert result['n_permutations'] == math.comb(13, 7)
+    assert result['statistic'] == pytest.approx(np.mean(x) - np.mean(y))
+    assert result['p_value'] == pytest.approx(brute_force_p(x, y))
+
+
+def test_monte_carlo_permutation_p_value(nlp, samples):
+    x, y = samples['classical'][:7], samples['medieval'][:6]
+    result = nlp.PermutationTest(n_resamples=20000, max_exact=0).test(x, y)
+    assert result['method'] == 'monte_carlo'
+    assert result['n_permutations'] == 20000
+    assert result['p_value'] == pytest.approx(brute_force_p(x, y), abs=0.01)
+
+
+def test_batch_test_matches_single_tests(nlp, samples):
+    tester = nlp.PermutationTest(n_resamples=5000, max_exact=1000)
+    tests = {'cl-me': (samples['classical'], samples['medieval']),
+             'me-sp': (samples['medieval'], samples['spanish']),
+             'cl-sp': (samples['classical'], samples['spanish']),
+             'empty': (samples['empty'], samples['spanish'])}
+    batched = tester.batch_test(tests)
+    assert list(batched) == list(tests)
+    for key in ('cl-me', 'me-sp', 'cl-sp'):
+        assert batched[key] == tester.test(*tests[key])
+    assert np.isnan(batched['empty']['p_value'])
@@ -3,16 +3,16 @@
 Quick test to verify corrected article rate calculations
 """
 
-import sys
 import importlib.util
 from pathlib import Path
 
-# Load the module with space in filename
-spec = importlib.util.spec_from_file_location("example_1", "example 1.py")
-example_1 = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(example_1)
+# Load the analysis module (digit-prefixed filename)
+spec = importlib.util.spec_from_file_location(
+    "nlp_analysis", Path(__file__).parent / "display/latin-spanish-complexity/code/02_nlp_analysis.py")
+nlp_analysis = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(nlp_analysis)
 
-EnhancedComplexityTracker = example_1.EnhancedComplexityTracker
+EnhancedComplexityTracker = nlp_analysis.EnhancedComplexityTracker
 
 def quick_corpus_test():
     print("Quick corpus test with corrected methodology...")
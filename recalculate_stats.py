@@ -5,25 +5,43 @@ Recalculate article development statistics with corrected methodology
 
 import sys
 import importlib.util
-import json
 import numpy as np
 from scipy import stats
 from pathlib import Path
 
-# Load the module with space in filename
-spec = importlib.util.spec_from_file_location("example_1", "example 1.py")
-example_1 = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(example_1)
+# Load the analysis module for its shared helpers (digit-prefixed filename)
+spec = importlib.util.spec_from_file_location(
+    "nlp_analysis", Path(__file__).parent / "display/latin-spanish-complexity/code/02_nlp_analysis.py")
+nlp_analysis = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(nlp_analysis)
 
-EnhancedComplexityTracker = example_1.EnhancedComplexityTracker
+# Results store written by analyze_full_corpus (02_nlp_analysis.py)
+RESULTS_DB = nlp_analysis.RESULTS_DB
 
-def recalculate_article_stats():
+PERIOD_NAMES = {
+    'Classical': 'Classical Latin',
+    'Medieval': 'Medieval Latin',
+    'Spanish': 'Early Spanish'
+}
+
+def load_article_counts(db_path=RESULTS_DB):
+    """Per-text article counts and word counts from the latest stored run"""
+    columns = ['function_words.total_by_type.articles', 'function_words.word_count']
+    rows = nlp_analysis.load_metrics(db_path, metrics=columns)
+    # Texts without any articles have no total_by_type.articles row
+    counts = rows.pivot_table(index=['text_name', 'period'], columns='metric',
+                              values='value', fill_value=0, sort=False)
+    counts = counts.reindex(columns=columns, fill_value=0)
+    counts.columns = ['articles', 'words']
+    return counts.reset_index()
+
+def recalculate_article_stats(db_path=RESULTS_DB):
     print("Recalculating article development statistics with CORRECTED methodology...")
     print("=" * 60)
-    
-    tracker = EnhancedComplexityTracker()
-    corpus = tracker.load_corpus()
-    
+
+    if not Path(db_path).exists():
+        sys.exit(f"No results store at {db_path}; run 02_nlp_analysis.py first")
+
     # Group texts by period
     periods = {
         'Classical Latin': [],
@@ -31,36 +49,21 @@ def recalculate_article_stats():
         'Early Spanish': []
     }
     
-    # Analyze each text
     all_results = {}
-    for text_name, text_content in corpus.items():
-        print(f"\nProcessing {text_name}...")
-        
-        # Determine period and language
-        if text_name.startswith('latin_'):
-            period = 'Classical Latin'
-            language = 'la'
-        elif text_name.startswith('medieval_'):
-            period = 'Medieval Latin'
-            language = 'la'
-        elif text_name.startswith('spanish_'):
-            period = 'Early Spanish'
-            language = 'es'
-        else:
+    for row in load_article_counts(db_path).itertuples(index=False):
+        period = PERIOD_NAMES.get(row.period)
+        if period is None:
             continue
-        
-        # Analyze function words (this will use our corrected article detection)
-        results = tracker.analyze_function_words(text_content, language)
-        
-        total_articles = results['total_by_type']['articles']
-        word_count = results['word_count']
+        print(f"\nProcessing {row.text_name}...")
+
+        total_articles = int(row.articles)
+        word_count = int(row.words)
         
         if word_count > 0:
             article_rate = (total_articles / word_count) * 1000  # per 1000 words
             periods[period].append(article_rate)
-            all_results[text_name] = {
+            all_results[row.text_name] = {
                 'period': period,
-                'language': language,
                 'articles': total_articles,
                 'words': word_count,
                 'rate_per_1000': article_rate
@@ -72,6 +75,7 @@ def recalculate_article_stats():
     print("=" * 60)
     
     # Calculate statistics for each period
+    bootstrap = nlp_analysis.BootstrapEngine()
     period_stats = {}
     for period, rates in periods.items():
         if rates:
@@ -83,14 +87,10 @@ def recalculate_article_stats():
                 'rates': rates
             }
             
-            # Bootstrap CI
-            n_bootstrap = 1000
-            bootstrap_means = []
-            for _ in range(n_bootstrap):
-                bootstrap_sample = np.random.choice(rates_array, size=len(rates_array), replace=True)
-                bootstrap_means.append(np.mean(bootstrap_sample))
-            period_stats[period]['ci_lower'] = np.percentile(bootstrap_means, 2.5)
-            period_stats[period]['ci_upper'] = np.percentile(bootstrap_means, 97.5)
+            # Bootstrap CI, from the same seeded engine as 02_nlp_analysis.py
+            ci = bootstrap.ci(rates_array)
+            period_stats[period]['ci_lower'] = ci[0]
+            period_stats[period]['ci_upper'] = ci[1]
             
             print(f"\n{period}:")
             print(f"  n = {len(rates)}")
@@ -136,4 +136,4 @@ def recalculate_article_stats():
     return period_stats, all_results
 
 if __name__ == "__main__":
-    stats_results, text_results = recalculate_article_stats()
\ No newline at end of file
+    stats_results, text_results = recalculate_article_stats(*sys.argv[1:2])
\ No newline at end of file